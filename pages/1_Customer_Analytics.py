@@ -336,17 +336,20 @@ def main():
             if not segments_df.empty:
                 # Summary table
                 st.dataframe(segments_df, use_container_width=True)
+                st.caption("Segments are derived automatically from each customer's lifetime value.")
                 
-                # Update segmentation
+                # Recompute lifetime values (and so segments) from orders
                 st.markdown("---")
-                if st.button("🔄 Update Customer Segmentation"):
-                    with st.spinner("Updating customer segments..."):
+                if st.button("🔄 Refresh Lifetime Values"):
+                    with st.spinner("Recomputing customer lifetime values..."):
                         try:
-                            sql_conn.update_customer_segmentation()
-                            st.success("Customer segmentation updated successfully!")
+                            customer_ids = sql_conn.fetch_scalars("SELECT CustomerID FROM ca.Customers")
+                            sql_conn.update_customer_lifetime_values(customer_ids)
+                            sql_conn.clear_cache()
+                            st.success("Customer lifetime values updated successfully!")
                             st.rerun()
                         except Exception as e:
-                            st.error(f"Error updating segmentation: {e}")
+                            st.error(f"Error updating lifetime values: {e}")
         
         except Exception as e:
             st.error(f"Error loading segmentation data: {e}")
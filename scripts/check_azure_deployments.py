@@ -10,10 +10,12 @@ load_dotenv()
 
 from openai import AzureOpenAI
 
+_BAR60 = "=" * 60
+
 def main():
-    print("=" * 60)
+    print(_BAR60)
     print("Checking Azure OpenAI Deployments")
-    print("=" * 60)
+    print(_BAR60)
     
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
     api_key = os.getenv("AZURE_OPENAI_API_KEY")
@@ -69,11 +71,11 @@ def main():
         else:
             print(f"   ❌ Error: {e}")
     
-    print("\n" + "=" * 60)
+    print("\n" + _BAR60)
     print("Available alternatives if embedding deployment is missing:")
     print("  - Deploy the embedding model in Azure OpenAI Studio")
     print("  - Use a different existing embedding deployment name in .env")
-    print("=" * 60)
+    print(_BAR60)
 
 
 if __name__ == "__main__":
@@ -7,28 +7,31 @@ import mssql_python
 import platform
 import sys
 
+_BAR80 = "=" * 80
+_RULE80 = "-" * 80
+
 
 def check_odbc_drivers():
     """Check for available ODBC drivers."""
-    print("=" * 80)
+    print(_BAR80)
     print("ODBC Driver Detection Tool")
-    print("=" * 80)
+    print(_BAR80)
     print(f"\nSystem: {platform.system()} {platform.release()}")
     print(f"Python: {sys.version}")
     print(f"mssql-python module: {mssql_python.__name__}")
     
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     print("SQL Server Driver Status:")
-    print("=" * 80)
+    print(_BAR80)
     
     try:
         # mssql-python bundles ODBC Driver 18 for SQL Server
         print("✅ mssql-python is installed")
         print("✅ ODBC Driver 18 for SQL Server (bundled with mssql-python)")
         
-        print("\n" + "=" * 80)
+        print("\n" + _BAR80)
         print("Recommendation:")
-        print("=" * 80)
+        print(_BAR80)
         print("✅ Driver ready to use: ODBC Driver 18 for SQL Server")
         print("\nmssql-python automatically handles driver management.")
         print("No additional ODBC driver installation needed!")
@@ -42,15 +45,15 @@ def check_odbc_drivers():
 
 def print_installation_instructions():
     """Print installation instructions based on OS."""
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     print("SQL Server ODBC Driver Installation Instructions")
-    print("=" * 80)
+    print(_BAR80)
     
     system = platform.system()
     
     if system == "Windows":
         print("\n📥 Windows Installation:")
-        print("-" * 80)
+        print(_RULE80)
         print("1. Download ODBC Driver 18 for SQL Server:")
         print("   https://learn.microsoft.com/en-us/sql/connect/odbc/download-odbc-driver-for-sql-server")
         print("\n2. Choose the appropriate installer:")
@@ -63,7 +66,7 @@ def print_installation_instructions():
         
     elif system == "Linux":
         print("\n📥 Linux Installation:")
-        print("-" * 80)
+        print(_RULE80)
         print("For Ubuntu/Debian:")
         print("  curl https://packages.microsoft.com/keys/microsoft.asc | sudo apt-key add -")
         print("  curl https://packages.microsoft.com/config/ubuntu/$(lsb_release -rs)/prod.list | \\")
@@ -78,26 +81,26 @@ def print_installation_instructions():
         
     elif system == "Darwin":
         print("\n📥 macOS Installation:")
-        print("-" * 80)
+        print(_RULE80)
         print("Using Homebrew:")
         print("  brew tap microsoft/mssql-release https://github.com/Microsoft/homebrew-mssql-release")
         print("  brew update")
         print("  HOMEBREW_ACCEPT_EULA=Y brew install msodbcsql18 mssql-tools18")
     
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     print("After Installation:")
-    print("=" * 80)
+    print(_BAR80)
     print("1. Close and reopen your terminal/IDE")
     print("2. Run this script again: python scripts/check_odbc_drivers.py")
     print("3. Update your .env file with the detected driver name")
-    print("=" * 80)
+    print(_BAR80)
 
 
 def check_env_file():
     """Check if .env file has the correct driver configuration."""
-    print("\n" + "=" * 80)
+    print("\n" + _BAR80)
     print("Checking .env Configuration:")
-    print("=" * 80)
+    print(_BAR80)
     
     env_file = ".env"
     if not os.path.exists(env_file):
@@ -131,16 +134,16 @@ if __name__ == "__main__":
     check_env_file()
     
     if success:
-        print("\n" + "=" * 80)
+        print("\n" + _BAR80)
         print("✅ System Ready for Azure SQL Connection!")
-        print("=" * 80)
+        print(_BAR80)
         print("\nNext steps:")
         print("1. Ensure your .env file has the correct driver name")
         print("2. Run: python scripts/setup_databases.py")
     else:
-        print("\n" + "=" * 80)
+        print("\n" + _BAR80)
         print("❌ Action Required: Install ODBC Driver")
-        print("=" * 80)
+        print(_BAR80)
         print("\nFollow the installation instructions above, then re-run this script.")
     
     sys.exit(0 if success else 1)
@@ -1,5 +1,5 @@
 """
-Create or update stored procedures in Fabric SQL Database
+Create or update stored procedures and views in Fabric SQL Database
 """
 import sys
 import os
@@ -10,11 +10,13 @@ load_dotenv()
 
 from src.database.fabric_sql import FabricSQLConnector
 
+_BAR60 = "=" * 60
+
 def create_stored_procedures():
     """Create stored procedures in Fabric SQL Database."""
-    print("=" * 60)
+    print(_BAR60)
     print("Creating Stored Procedures")
-    print("=" * 60)
+    print(_BAR60)
     
     try:
         sql_conn = FabricSQLConnector(
@@ -22,18 +24,29 @@ def create_stored_procedures():
             database=os.getenv("FABRIC_SQL_DATABASE")
         )
         
-        if not sql_conn.test_connection():
-            raise Exception("Connection test failed")
-        
-        print("✓ Fabric SQL Database connected\n")
-        
         # Create sp_UpdateCustomerLifetimeValue
-        print("Creating ca.sp_UpdateCustomerLifetimeValue...")
         sp1 = """
         IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'ca.sp_UpdateCustomerLifetimeValue') AND type in (N'P', N'PC'))
             DROP PROCEDURE ca.sp_UpdateCustomerLifetimeValue;
         """
-        sql_conn.execute_non_query(sp1)
+        # The first real statement doubles as the connection check
+        try:
+            sql_conn.execute_non_query(sp1)
+        except Exception as e:
+            raise Exception(f"Connection test failed: {e}") from e
+        
+        print("✓ Fabric SQL Database connected\n")
+        
+        # Covering index for the lifetime value aggregates over ca.Orders
+        print("Creating IX_Orders_Customer_Status_Incl...")
+        ix1 = """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID(N'ca.Orders') AND name = N'IX_Orders_Customer_Status_Incl')
+            CREATE INDEX IX_Orders_Customer_Status_Incl ON ca.Orders(CustomerID, OrderStatus) INCLUDE (TotalAmount, OrderDate);
+        """
+        sql_conn.execute_non_query(ix1)
+        print("✓ IX_Orders_Customer_Status_Incl created\n")
+        
+        print("Creating ca.sp_UpdateCustomerLifetimeValue...")
         
         sp1_create = """
         CREATE PROCEDURE ca.sp_UpdateCustomerLifetimeValue
@@ -58,35 +71,104 @@ def create_stored_procedures():
         sql_conn.execute_non_query(sp1_create)
         print("✓ ca.sp_UpdateCustomerLifetimeValue created\n")
         
-        # Create sp_UpdateCustomerSegmentation
-        print("Creating ca.sp_UpdateCustomerSegmentation...")
+        # Create sp_UpdateCustomerLifetimeValueBatch (set-based, one call for many customers)
+        print("Creating ca.sp_UpdateCustomerLifetimeValueBatch...")
+        tvp_create = """
+        IF TYPE_ID(N'ca.IntList') IS NULL
+            CREATE TYPE ca.IntList AS TABLE (Id INT PRIMARY KEY);
+        """
+        sql_conn.execute_non_query(tvp_create)
+        
+        sp1_batch = """
+        IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'ca.sp_UpdateCustomerLifetimeValueBatch') AND type in (N'P', N'PC'))
+            DROP PROCEDURE ca.sp_UpdateCustomerLifetimeValueBatch;
+        """
+        sql_conn.execute_non_query(sp1_batch)
+        
+        sp1_batch_create = """
+        CREATE PROCEDURE ca.sp_UpdateCustomerLifetimeValueBatch
+            @Ids ca.IntList READONLY
+        AS
+        BEGIN
+            UPDATE c
+            SET TotalLifetimeValue = x.LifetimeValue,
+                LastPurchaseDate = x.LastPurchaseDate
+            FROM ca.Customers c
+            JOIN @Ids i ON c.CustomerID = i.Id
+            OUTER APPLY (
+                SELECT
+                    ISNULL(SUM(CASE WHEN o.OrderStatus NOT IN ('Cancelled') THEN o.TotalAmount END), 0) AS LifetimeValue,
+                    MAX(o.OrderDate) AS LastPurchaseDate
+                FROM ca.Orders o
+                WHERE o.CustomerID = i.Id
+            ) x;
+        END;
+        """
+        sql_conn.execute_non_query(sp1_batch_create)
+        print("✓ ca.sp_UpdateCustomerLifetimeValueBatch created\n")
+        
+        # Replace sp_UpdateCustomerSegmentation with a persisted computed column
+        print("Converting ca.Customers.CustomerSegment to a computed column...")
         sp2 = """
         IF EXISTS (SELECT * FROM sys.objects WHERE object_id = OBJECT_ID(N'ca.sp_UpdateCustomerSegmentation') AND type in (N'P', N'PC'))
             DROP PROCEDURE ca.sp_UpdateCustomerSegmentation;
         """
         sql_conn.execute_non_query(sp2)
         
-        sp2_create = """
-        CREATE PROCEDURE ca.sp_UpdateCustomerSegmentation
-        AS
+        seg_drop = """
+        IF EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'ca.Customers') AND name = N'CustomerSegment' AND is_computed = 0)
         BEGIN
-            UPDATE ca.Customers
-            SET CustomerSegment = 
-                CASE 
+            IF EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID(N'ca.Customers') AND name = N'IX_Customers_Segment')
+                DROP INDEX IX_Customers_Segment ON ca.Customers;
+            ALTER TABLE ca.Customers DROP COLUMN CustomerSegment;
+        END;
+        """
+        sql_conn.execute_non_query(seg_drop)
+        
+        seg_create = """
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'ca.Customers') AND name = N'CustomerSegment')
+            ALTER TABLE ca.Customers ADD CustomerSegment AS (
+                CASE
                     WHEN TotalLifetimeValue >= 10000 THEN 'Premium'
                     WHEN TotalLifetimeValue >= 5000 THEN 'Gold'
                     WHEN TotalLifetimeValue >= 1000 THEN 'Silver'
                     ELSE 'Bronze'
                 END
-            WHERE IsActive = 1;
-        END;
+            ) PERSISTED;
+        """
+        sql_conn.execute_non_query(seg_create)
+        
+        seg_index = """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE object_id = OBJECT_ID(N'ca.Customers') AND name = N'IX_Customers_Segment')
+            CREATE INDEX IX_Customers_Segment ON ca.Customers(CustomerSegment);
+        """
+        sql_conn.execute_non_query(seg_index)
+        print("✓ ca.Customers.CustomerSegment is now computed from TotalLifetimeValue\n")
+        
+        # Create vw_TableCounts
+        print("Creating ca.vw_TableCounts...")
+        vw1 = """
+        IF EXISTS (SELECT * FROM sys.views WHERE object_id = OBJECT_ID(N'ca.vw_TableCounts'))
+            DROP VIEW ca.vw_TableCounts;
+        """
+        sql_conn.execute_non_query(vw1)
+        
+        vw1_create = """
+        CREATE VIEW ca.vw_TableCounts AS
+        SELECT 1 AS SortOrder, 'Products' AS TableName, COUNT_BIG(*) AS RecordCount FROM ca.Products
+        UNION ALL
+        SELECT 2, 'Customers', COUNT_BIG(*) FROM ca.Customers
+        UNION ALL
+        SELECT 3, 'Orders', COUNT_BIG(*) FROM ca.Orders
+        UNION ALL
+        SELECT 4, 'OrderItems', COUNT_BIG(*) FROM ca.OrderItems;
         """
-        sql_conn.execute_non_query(sp2_create)
-        print("✓ ca.sp_UpdateCustomerSegmentation created\n")
+        sql_conn.execute_non_query(vw1_create)
+        print("✓ ca.vw_TableCounts created\n")
         
-        print("=" * 60)
+        print(_BAR60)
         print("✅ All stored procedures created successfully!")
-        print("=" * 60)
+        print(_BAR60)
         
     except Exception as e:
         print(f"❌ Error creating stored procedures: {e}")
@@ -3,67 +3,86 @@ Quick script to summarize all data in both Fabric databases
 """
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from dotenv import load_dotenv
-load_dotenv()
+_BAR70 = "=" * 70
+_RULE70 = "-" * 70
+
+REQUIRED_ENV_VARS = ["FABRIC_SQL_ENDPOINT", "FABRIC_COSMOSDB_ENDPOINT"]
 
-from src.database.fabric_sql import FabricSQLConnector
-from src.database.fabric_cosmos import FabricCosmosDBConnector
 
 def main():
-    print("=" * 70)
+    argparse.ArgumentParser(
+        description="Summarize record counts in the Fabric SQL and CosmosDB databases."
+    ).parse_args()
+    
+    from src.utils.config import load_environment
+    load_environment()
+    missing = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    if missing:
+        print(f"❌ Missing required environment variables: {', '.join(missing)}")
+        return 1
+    
+    # Deferred so --help and configuration errors skip the pandas/driver import cost
+    from src.database.fabric_sql import FabricSQLConnector
+    from src.database.fabric_cosmos import FabricCosmosDBConnector
+    
+    print(_BAR70)
     print("DATABASE SUMMARY - Microsoft Fabric")
-    print("=" * 70)
+    print(_BAR70)
     
     # =========================================================================
     # FABRIC SQL DATABASE
     # =========================================================================
     print("\n📊 FABRIC SQL DATABASE")
-    print("-" * 70)
+    print(_RULE70)
     
-    # Initialize SQL connector
+    # Initialize SQL connector; looking up the counts view doubles as the
+    # connection check, so connection and view problems are reported apart
+    sql_total = 0
+    sql_conn = None
+    sql_counts = None
     try:
         sql_conn = FabricSQLConnector(
             endpoint=os.getenv("FABRIC_SQL_ENDPOINT"),
             database=os.getenv("FABRIC_SQL_DATABASE")
         )
-        if not sql_conn.test_connection():
-            raise Exception("Connection test failed")
+        view_id = sql_conn.fetch_scalars("SELECT OBJECT_ID(N'ca.vw_TableCounts')")[0]
         print("✓ Connected\n")
     except Exception as e:
         print(f"❌ Error connecting to SQL: {e}\n")
         sql_conn = None
     
-    # Count records in each SQL table
-    if sql_conn:
-        tables = {
-            'Products': 'ca.Products',
-            'Customers': 'ca.Customers',
-            'Orders': 'ca.Orders',
-            'OrderItems': 'ca.OrderItems'
-        }
-        
-        sql_total = 0
-        print("Table Record Counts:")
-        for table_name, table_path in tables.items():
+    if sql_conn is not None:
+        if view_id is None:
+            print(f"  {'Table counts':20} : ERROR - ca.vw_TableCounts not found")
+            print("  Run scripts/create_stored_procedures.py to create ca.vw_TableCounts")
+        else:
             try:
-                query = f"SELECT COUNT(*) as count FROM {table_path}"
-                df = sql_conn.execute_query(query)
-                count = df['count'].iloc[0]
-                sql_total += count
-                print(f"  {table_name:20} : {count:>6} records")
+                # One view keeps a single cached plan instead of an ad-hoc COUNT per table
+                sql_counts = sql_conn.execute_query(
+                    "SELECT TableName, RecordCount FROM ca.vw_TableCounts ORDER BY SortOrder"
+                )
             except Exception as e:
-                print(f"  {table_name:20} : ERROR - {e}")
+                print(f"  {'Table counts':20} : ERROR - {e}")
+    
+    # Count records in each SQL table
+    if sql_counts is not None:
+        print("Table Record Counts:")
+        for _, row in sql_counts.iterrows():
+            count = int(row['RecordCount'])
+            sql_total += count
+            print(f"  {row['TableName']:20} : {count:>6} records")
         
         print(f"\n{'Total SQL Records':20} : {sql_total:>6}")
     
     # =========================================================================
     # FABRIC COSMOSDB NOSQL
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("📊 FABRIC COSMOSDB NOSQL")
-    print("-" * 70)
+    print(_RULE70)
     
     # Initialize CosmosDB connector
     try:
@@ -85,59 +104,45 @@ def main():
     if cosmos_conn:
         print("Container Record Counts:")
         
-        # Products
-        try:
-            products = cosmos_conn.get_all_products(limit=10000)
-            product_count = len(products)
-            cosmos_total += product_count
-            print(f"  {'Products':20} : {product_count:>6} records")
-            
-            # Check for embeddings
-            if products:
-                has_embeddings = 'embedding' in products[0] or 'descriptionEmbedding' in products[0]
-                print(f"    └─ Embeddings: {'✓ Yes' if has_embeddings else '✗ No'}")
-        except Exception as e:
-            print(f"  {'Products':20} : ERROR - {e}")
-        
-        # Reviews
-        try:
-            query = "SELECT * FROM c WHERE c.type = 'review'"
-            reviews = list(cosmos_conn.reviews_container.query_items(
-                query=query,
-                enable_cross_partition_query=True
-            ))
-            review_count = len(reviews)
-            cosmos_total += review_count
-            print(f"  {'Reviews':20} : {review_count:>6} records")
-            
-            # Check for embeddings
-            if reviews:
-                has_embeddings = 'embedding' in reviews[0]
-                print(f"    └─ Embeddings: {'✓ Yes' if has_embeddings else '✗ No'}")
-        except Exception as e:
-            print(f"  {'Reviews':20} : ERROR - {e}")
-        
-        # Sessions
-        try:
-            query = "SELECT VALUE COUNT(1) FROM c"
-            result = list(cosmos_conn.container.query_items(
-                query=query,
-                enable_cross_partition_query=True
-            ))
-            session_count = result[0] if result else 0
-            cosmos_total += session_count
-            print(f"  {'Sessions':20} : {session_count:>6} records")
-        except Exception as e:
-            print(f"  {'Sessions':20} : ERROR - {e}")
+        # Server-side COUNT plus a TOP 1 projection for the embedding check,
+        # so no container is materialized client-side
+        containers = [
+            ('Products', cosmos_conn.products_container, "",
+             "IS_DEFINED(c.embedding) OR IS_DEFINED(c.descriptionEmbedding)"),
+            ('Reviews', cosmos_conn.reviews_container, " WHERE c.type = 'review'",
+             "IS_DEFINED(c.embedding)"),
+            ('Sessions', cosmos_conn.container, "", None),
+        ]
+        for label, container, where, embedding_check in containers:
+            try:
+                result = cosmos_conn.query_items(
+                    f"SELECT VALUE COUNT(1) FROM c{where}",
+                    container=container
+                )
+                count = result[0] if result else 0
+                cosmos_total += count
+                print(f"  {label:20} : {count:>6} records")
+                
+                # Check for embeddings
+                if embedding_check and count:
+                    sample = cosmos_conn.query_items(
+                        f"SELECT TOP 1 VALUE ({embedding_check}) FROM c{where}",
+                        container=container,
+                        max_item_count=1
+                    )
+                    has_embeddings = bool(sample and sample[0])
+                    print(f"    └─ Embeddings: {'✓ Yes' if has_embeddings else '✗ No'}")
+            except Exception as e:
+                print(f"  {label:20} : ERROR - {e}")
         
         print(f"\n{'Total CosmosDB Records':20} : {cosmos_total:>6}")
     
     # =========================================================================
     # SUMMARY
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("✅ SUMMARY")
-    print("=" * 70)
+    print(_BAR70)
     
     if sql_conn and cosmos_conn:
         print(f"\nFabric SQL Database    : {sql_total:>6} records")
@@ -150,8 +155,8 @@ def main():
         print("\n⚠️  Some database connections failed.")
         print("   Run setup_environment.py to initialize your environment.")
     
-    print("=" * 70)
+    print(_BAR70)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
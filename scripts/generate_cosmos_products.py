@@ -14,6 +14,8 @@ import asyncio
 from datetime import datetime
 import random
 
+_BAR60 = "=" * 60
+
 # Sample product data
 SAMPLE_PRODUCTS = [
     {
@@ -140,9 +142,9 @@ SAMPLE_PRODUCTS = [
 
 async def generate_products():
     """Generate products with embeddings in CosmosDB"""
-    print("=" * 60)
+    print(_BAR60)
     print("Generating Products with Embeddings in CosmosDB")
-    print("=" * 60)
+    print(_BAR60)
     
     # Initialize CosmosDB
     try:
@@ -3,10 +3,19 @@ Generate sample data for the Customer Analytics Platform using Microsoft Fabric
 """
 import sys
 import os
-from datetime import datetime, timedelta
-import random
+import argparse
+from datetime import date, datetime, timedelta
+from itertools import islice, repeat
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import uuid
+import zlib
+import numpy as np
 from faker import Faker
 import json
+import logging
+from logging.handlers import RotatingFileHandler
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -16,173 +25,548 @@ load_dotenv()
 
 from src.database.fabric_sql import FabricSQLConnector
 from src.database.fabric_cosmos import FabricCosmosDBConnector
-from src.agent_integration import get_embedding_service, generate_embeddings
+from src.agent_integration import get_embedding_service, generate_embeddings, close_embedding_service
+
+_BAR70 = "=" * 70
+_RULE70 = "-" * 70
+
+# Rows per transaction for row-by-row SQL inserts
+SQL_COMMIT_INTERVAL = 500
+# Rows per retry transaction when a whole bulk insert fails
+SQL_FALLBACK_CHUNK_SIZE = 50
+# Rows per bulk insert transaction; rows are pulled from the source lazily,
+# one chunk at a time
+SQL_STREAM_CHUNK_ROWS = 10000
+# Row-by-row INSERT statements; one constant text per table so every call
+# reuses the same cached plan on the server
+CUSTOMER_INSERT = """
+INSERT INTO ca.Customers
+(FirstName, LastName, Email, Phone, DateOfBirth, Country, City)
+OUTPUT INSERTED.CustomerID
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+PRODUCT_INSERT = """
+INSERT INTO ca.Products (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+ORDER_INSERT = """
+INSERT INTO ca.Orders (CustomerID, OrderDate, TotalAmount, OrderStatus)
+OUTPUT INSERTED.OrderID
+VALUES (?, ?, ?, ?)
+"""
+ORDER_ITEM_INSERT = """
+INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice, Discount)
+VALUES (?, ?, ?, ?, ?)
+"""
+# Column names and OPENJSON types of the bulk-loaded tables, in row tuple
+# order; DATETIME2 accepts the microseconds Python datetimes carry
+PRODUCT_COLUMNS = (
+    ('ProductName', 'NVARCHAR(255)'),
+    ('SKU', 'NVARCHAR(50)'),
+    ('Category', 'NVARCHAR(100)'),
+    ('SubCategory', 'NVARCHAR(100)'),
+    ('UnitPrice', 'DECIMAL(18,2)'),
+    ('StockQuantity', 'INT'),
+)
+ORDER_COLUMNS = (
+    ('CustomerID', 'INT'),
+    ('OrderDate', 'DATETIME2'),
+    ('TotalAmount', 'DECIMAL(18,2)'),
+    ('OrderStatus', 'NVARCHAR(50)'),
+)
+ORDER_ITEM_COLUMNS = (
+    ('OrderID', 'INT'),
+    ('ProductID', 'INT'),
+    ('Quantity', 'INT'),
+    ('UnitPrice', 'DECIMAL(18,2)'),
+    ('Discount', 'DECIMAL(5,2)'),
+)
+# Connector warnings and errors go to this file instead of the console, so a
+# run with many failures is not held up writing them to a terminal or pipe
+LOG_FILE = "generate_sample_data.log"
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+# Nonclustered indexes (from sql/fabric_sql_schema.sql) disabled while a
+# table is bulk loaded and rebuilt once afterwards
+BULK_LOAD_INDEXES = {
+    'ca.Orders': ('IX_Orders_CustomerID', 'IX_Orders_OrderDate', 'IX_Orders_Customer_Status_Incl'),
+    'ca.OrderItems': ('IX_OrderItems_OrderID', 'IX_OrderItems_ProductID'),
+}
+# Documents per embed-then-write block; the next block is embedded while
+# the previous one is written to Cosmos
+COSMOS_PIPELINE_BLOCK = 1000
+# Cosmos ids fetched per query page / pages deleted concurrently when truncating
+COSMOS_DELETE_PAGE_SIZE = 100
+COSMOS_DELETE_WORKERS = 8
+# Connector attribute and partition key path of each Cosmos container; deletes
+# project only id and this field
+COSMOS_PARTITION_KEYS = {
+    'products': ('products_container', 'category'),
+    'reviews': ('reviews_container', 'productId'),
+    'sessions': ('container', 'customerId'),
+}
+# Distinct names/countries/cities generated by Faker for customer rows
+FAKER_POOL_SIZE = 500
+# Fallback vector size (OpenAI ada-002)
+EMBEDDING_DIMENSIONS = 1536
+# Shared by every item whose text could not be embedded; a tuple, so no
+# caller can modify it, and it serializes to the same JSON array as a list
+ZERO_EMBEDDING = (0.0,) * EMBEDDING_DIMENSIONS
+
+# Product categories and their subcategories
+PRODUCT_CATEGORIES = {
+    'Electronics': ['Smartphones', 'Laptops', 'Tablets', 'Accessories'],
+    'Clothing': ['Men', 'Women', 'Kids', 'Accessories'],
+    'Home': ['Furniture', 'Decor', 'Kitchen', 'Bedding'],
+    'Sports': ['Fitness', 'Outdoor', 'Team Sports', 'Water Sports']
+}
+CATEGORY_NAMES = list(PRODUCT_CATEGORIES)
+# Flattened subcategories and where each category's run starts, for
+# sampling (category, subcategory) pairs as whole columns
+SUBCATEGORY_NAMES = np.array([sub for name in CATEGORY_NAMES for sub in PRODUCT_CATEGORIES[name]], dtype=object)
+SUBCATEGORY_COUNTS = np.array([len(PRODUCT_CATEGORIES[name]) for name in CATEGORY_NAMES])
+SUBCATEGORY_OFFSETS = np.cumsum(SUBCATEGORY_COUNTS) - SUBCATEGORY_COUNTS
+
+# Product copy templates for the Cosmos catalog
+PRODUCT_DESCRIPTION_TEMPLATE = (
+    "High-quality {subcategory} product from {brand}. "
+    "Perfect for everyday use with excellent features and durability."
+)
+LONG_DESCRIPTION_SUFFIX = " Features include premium materials, modern design, and reliable performance."
+
+# Review copy, one row of templates per sentiment label
+REVIEW_SENTIMENTS = ['positive', 'neutral', 'negative']
+REVIEW_TEMPLATES = {
+    'positive': [
+        "Excellent product! Highly recommend.",
+        "Great quality and fast shipping. Very satisfied!",
+        "Amazing! Exceeded my expectations.",
+        "Perfect! Exactly what I needed.",
+        "Love it! Will definitely buy again."
+    ],
+    'neutral': [
+        "It's okay. Does the job but nothing special.",
+        "Decent product for the price.",
+        "Average quality. Met expectations.",
+        "Not bad, not great. It's fine.",
+        "Works as expected."
+    ],
+    'negative': [
+        "Disappointed. Not as described.",
+        "Poor quality. Would not recommend.",
+        "Broke after a few uses. Waste of money.",
+        "Not satisfied with this purchase.",
+        "Below expectations. Returning it."
+    ]
+}
+# (sentiment x template) lookup table for vectorized text picks
+REVIEW_TEMPLATE_TABLE = np.array([REVIEW_TEMPLATES[label] for label in REVIEW_SENTIMENTS], dtype=object)
+
+# Fixed value pools for the other generators
+PRODUCT_BRANDS = ['TechPro', 'StyleMax', 'HomeComfort', 'SportFit', 'Premium Choice']
+ORDER_STATUSES = ['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']
+SESSION_PAGES = ['/home', '/products', '/cart', '/checkout', '/account']
+SESSION_EVENT_TYPES = ['pageView', 'productView', 'addToCart', 'search']
+DEVICE_TYPES = ['desktop', 'mobile', 'tablet']
+BROWSERS = ['Chrome', 'Firefox', 'Safari', 'Edge']
+
+# Seed for every random source, so re-runs regenerate identical data (and
+# identical embedding inputs)
+SEED = int(os.getenv("SEED", "42"))
 
 fake = Faker()
+fake.seed_instance(SEED)
+
+
+def seeded_rng(stream):
+    """
+    Return the numpy Generator for one generator.
+    
+    Each generator gets its own stream derived from SEED, so the output stays
+    reproducible even though main() runs the generators concurrently.
+    """
+    stream_seed = zlib.crc32(stream.encode())
+    return np.random.default_rng([SEED, stream_seed])
+
+
+# Embeddings already fetched in this run, keyed by text
+_embedding_cache = {}
+
+
+def print_error_summary(errors, action):
+    """Print one line for the per-item failures of a loop, counted by exception type."""
+    if errors:
+        print(f"Errors {action}: {dict(errors)}")
+
+
+def _embed_individually(texts, embedding_service, label):
+    """Embed texts one request each; texts that fail come back as None."""
+    vectors = []
+    errors = Counter()
+    for text in texts:
+        try:
+            vectors.append(generate_embeddings([text], embedding_service)[0])
+        except Exception as e:
+            errors[type(e).__name__] += 1
+            vectors.append(None)
+    print_error_summary(errors, f"generating {label} embeddings")
+    return vectors
+
+
+# Source of --fake-embeddings vectors; one stream so successive calls never repeat vectors
+_fake_embedding_rng = np.random.default_rng(SEED)
+
+
+def fake_embeddings(texts):
+    """Return seeded random unit vectors, one per distinct text, without calling the API."""
+    unique_texts = list(dict.fromkeys(texts))
+    vectors = _fake_embedding_rng.standard_normal((len(unique_texts), EMBEDDING_DIMENSIONS)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    by_text = dict(zip(unique_texts, vectors.tolist()))
+    return [by_text[text] for text in texts]
+
+
+def embed_texts(texts, embedding_service, label="item"):
+    """
+    Generate embeddings for texts with one generate_embeddings call.
+    
+    generate_embeddings does the batching, concurrency and rate-limit
+    backoff. Each distinct text is embedded once per run, so templated
+    texts (e.g. reviews drawn from a fixed pool) cost one embedding per
+    template, not per item, and generating the same data again reuses the
+    earlier vectors. If the call fails, texts are retried one at a time;
+    texts that still fail get a zero vector so the caller can insert every
+    item.
+    
+    Without an embedding_service (--fake-embeddings) random unit vectors
+    are returned instead.
+    """
+    if embedding_service is None:
+        return fake_embeddings(texts)
+    
+    unique_texts = [text for text in dict.fromkeys(texts) if text not in _embedding_cache]
+    vectors = []
+    if unique_texts:
+        try:
+            vectors = generate_embeddings(unique_texts, embedding_service)
+            if len(vectors) != len(unique_texts):
+                raise ValueError(f"expected {len(unique_texts)} embeddings, got {len(vectors)}")
+        except Exception as e:
+            print(f"Warning: Embedding {label}s failed, retrying individually: {e}")
+            vectors = _embed_individually(unique_texts, embedding_service, label)
+    
+    for text, vector in zip(unique_texts, vectors):
+        if vector is not None:
+            _embedding_cache[text] = vector
+    return [_embedding_cache.get(text, ZERO_EMBEDDING) for text in texts]
+
+
+def embed_and_write(documents, texts, embedding_service, write, label="item"):
+    """
+    Embed texts and write (document, vector) pairs block by block.
+    
+    Blocks of COSMOS_PIPELINE_BLOCK documents go through a two-stage
+    pipeline: while one block is written, the next one is embedded. At most
+    one write is in flight, so finished blocks never pile up in memory.
+    
+    Args:
+        documents: Cosmos documents, aligned with texts
+        texts: Text to embed for each document
+        embedding_service: Embeddings client, or None for fake vectors
+        write: Bulk create callable taking a list of (document, vector)
+        label: Document kind used in messages
+        
+    Returns:
+        Number of documents written
+    """
+    created = 0
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for start in range(0, len(documents), COSMOS_PIPELINE_BLOCK):
+            block = documents[start:start + COSMOS_PIPELINE_BLOCK]
+            vectors = embed_texts(texts[start:start + COSMOS_PIPELINE_BLOCK], embedding_service, label=label)
+            if pending:
+                created += pending.result()
+            pending = writer.submit(write, list(zip(block, vectors)))
+        if pending:
+            created += pending.result()
+    return created
+
+
+def _insert_slice(sql_conn, table, columns, rows, label):
+    """Insert one slice in a single transaction, falling back to smaller chunks."""
+    try:
+        return sql_conn.insert_json_rows(table, columns, rows)
+    except Exception as e:
+        print(f"Warning: Bulk insert of {len(rows)} {label}s failed, retrying in chunks: {e}")
+    
+    inserted = 0
+    errors = Counter()
+    for start in range(0, len(rows), SQL_FALLBACK_CHUNK_SIZE):
+        chunk = rows[start:start + SQL_FALLBACK_CHUNK_SIZE]
+        try:
+            inserted += sql_conn.insert_json_rows(table, columns, chunk)
+        except Exception as e:
+            errors[type(e).__name__] += 1
+    print_error_summary(errors, f"inserting {label} chunks of {SQL_FALLBACK_CHUNK_SIZE}")
+    return inserted
+
+
+def bulk_insert_rows(sql_conn, table, columns, rows, label="row"):
+    """
+    Insert rows into table, one JSON array parameter per chunk.
+    
+    columns lists the (name, SQL type) of each tuple position. rows may be any iterable, including a generator: it is consumed in
+    SQL_STREAM_CHUNK_ROWS chunks, so memory stays bounded however many rows
+    it yields. Up to one chunk per pooled connection is in flight at once,
+    each in its own transaction. A chunk that fails is rolled back and
+    retried in SQL_FALLBACK_CHUNK_SIZE pieces so one bad row only loses its
+    own piece.
+    
+    Returns:
+        Number of rows inserted
+    """
+    rows = iter(rows)
+    workers = max(1, sql_conn.pool_size)
+    inserted = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            chunk = list(islice(rows, SQL_STREAM_CHUNK_ROWS))
+            if not chunk:
+                break
+            # Wait for a free connection before generating more rows
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                inserted += sum(future.result() for future in done)
+            pending.add(executor.submit(_insert_slice, sql_conn, table, columns, chunk, label))
+        inserted += sum(future.result() for future in pending)
+    return inserted
+
+
+@contextmanager
+def bulk_load_mode(sql_conn, table):
+    """
+    Skip foreign key checks and index maintenance while bulk loading a table.
+    
+    The referenced rows were generated by this script, so checking every
+    inserted row is wasted work. Afterwards the indexes are rebuilt and the
+    constraints re-enabled WITH CHECK, so they stay trusted by the optimizer.
+    Without ALTER permission the load simply runs with checks on.
+    """
+    indexes = BULK_LOAD_INDEXES.get(table, ())
+    try:
+        sql_conn.execute_non_query(f"ALTER TABLE {table} NOCHECK CONSTRAINT ALL")
+        for index in indexes:
+            sql_conn.execute_non_query(f"ALTER INDEX {index} ON {table} DISABLE")
+    except Exception as e:
+        print(f"Warning: Could not relax constraints on {table}: {e}")
+    try:
+        yield
+    finally:
+        try:
+            for index in indexes:
+                sql_conn.execute_non_query(f"ALTER INDEX {index} ON {table} REBUILD")
+            sql_conn.execute_non_query(f"ALTER TABLE {table} WITH CHECK CHECK CONSTRAINT ALL")
+        except Exception as e:
+            print(f"Warning: Could not restore constraints on {table}: {e}")
+
+
+def sample_categories(np_rng, n):
+    """
+    Draw n (category, subcategory) pairs: a uniform category, then a uniform
+    subcategory within it.
+    
+    Returns:
+        Tuple of (categories, subcategories) lists
+    """
+    category_indices = np_rng.integers(0, len(CATEGORY_NAMES), n)
+    subcategory_indices = SUBCATEGORY_OFFSETS[category_indices] + (
+        np_rng.random(n) * SUBCATEGORY_COUNTS[category_indices]
+    ).astype(np.int64)
+    return [CATEGORY_NAMES[i] for i in category_indices.tolist()], SUBCATEGORY_NAMES[subcategory_indices].tolist()
+
+
+def sample_distinct_indices(np_rng, population, counts):
+    """
+    Draw counts[i] distinct indices from range(population) for every i.
+    
+    Each row ranks a row of random keys and keeps its first counts[i]
+    positions, so all rows are sampled in a few vectorized calls instead of
+    one random.sample() per row. Rows are processed in blocks to bound the
+    size of the key matrix.
+    
+    Returns:
+        Flat array of indices, row after row
+    """
+    counts = np.asarray(counts)
+    if not len(counts) or not population:
+        return np.empty(0, dtype=np.int64)
+    max_count = int(counts.max())
+    rows_per_block = max(1, 1_000_000 // population)
+    picks = []
+    for start in range(0, len(counts), rows_per_block):
+        block_counts = counts[start:start + rows_per_block]
+        ranks = np.argsort(np_rng.random((len(block_counts), population)), axis=1)[:, :max_count]
+        picks.append(ranks[np.arange(max_count) < block_counts[:, None]])
+    return np.concatenate(picks)
 
 
 def generate_customer_data(sql_conn, num_customers=100, bulk_insert=False):
-    """Generate sample customer data."""
+    """Generate sample customer data and return the new CustomerIDs."""
     print(f"Generating {num_customers} customers...")
     
-    segments = ['Bronze', 'Silver', 'Gold', 'Premium']
+    np_rng = seeded_rng('customers')
+    
+    # Faker is only called to fill small pools; every column is then drawn
+    # from the pools (or generated) with numpy, since calling the providers
+    # per row adds no realism
+    pool_size = min(num_customers, FAKER_POOL_SIZE)
+    first_name_pool = [fake.first_name() for _ in range(pool_size)]
+    last_name_pool = [fake.last_name() for _ in range(pool_size)]
+    country_pool = [fake.country()[:100] for _ in range(pool_size)]
+    city_pool = [fake.city()[:100] for _ in range(pool_size)]
     
+    # Stage the rows column-wise, then zip them into parameter tuples
+    first_names = np_rng.choice(first_name_pool, num_customers).tolist()
+    last_names = np_rng.choice(last_name_pool, num_customers).tolist()
+    # Email is UNIQUE, so make it from the name, a per-run tag and the row number
+    run_tag = uuid.uuid4().hex[:6]
+    domains = np_rng.choice(['example.com', 'example.net', 'example.org'], num_customers).tolist()
+    emails = [
+        f"{''.join(filter(str.isalnum, first))}.{''.join(filter(str.isalnum, last))}.{run_tag}{i}@{domain}".lower()
+        for i, (first, last, domain) in enumerate(zip(first_names, last_names, domains))
+    ]
+    # Fixed-width format fits Phone NVARCHAR(20) without truncating
+    phones = [
+        f"{area}-{exchange}-{line:04d}"
+        for area, exchange, line in zip(
+            np_rng.integers(200, 1000, num_customers).tolist(),
+            np_rng.integers(200, 1000, num_customers).tolist(),
+            np_rng.integers(0, 10000, num_customers).tolist()
+        )
+    ]
+    # Ages 18-80
+    today = date.today()
+    birth_dates = [today - timedelta(days=d) for d in np_rng.integers(18 * 365, 80 * 365, num_customers).tolist()]
+    countries = np_rng.choice(country_pool, num_customers).tolist()
+    cities = np_rng.choice(city_pool, num_customers).tolist()
+    customers = list(zip(first_names, last_names, emails, phones, birth_dates, countries, cities))
+    
+    customer_ids = []
     if bulk_insert:
-        # Generate all data first
-        customers = []
-        for i in range(num_customers):
-            customers.append((
-                fake.first_name(),
-                fake.last_name(),
-                fake.email(),
-                fake.phone_number()[:20],
-                fake.date_of_birth(minimum_age=18, maximum_age=80),
-                fake.country()[:100],
-                fake.city()[:100],
-                random.choice(segments)
-            ))
-        
         # Bulk insert
         try:
-            query = """
-            INSERT INTO ca.Customers 
-            (FirstName, LastName, Email, Phone, DateOfBirth, Country, City, CustomerSegment)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            with sql_conn.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.executemany(query, customers)
-                    conn.commit()
+            customer_ids = sql_conn.insert_customers_bulk(customers)
             print(f"✓ Generated {num_customers} customers (bulk insert)")
         except Exception as e:
             print(f"Error bulk inserting customers: {e}")
     else:
-        # Row by row insert
-        for i in range(num_customers):
-            customer_data = {
-                'FirstName': fake.first_name(),
-                'LastName': fake.last_name(),
-                'Email': fake.email(),
-                'Phone': fake.phone_number()[:20],
-                'DateOfBirth': fake.date_of_birth(minimum_age=18, maximum_age=80),
-                'Country': fake.country()[:100],
-                'City': fake.city()[:100],
-                'CustomerSegment': random.choice(segments)
-            }
-            
-            try:
-                sql_conn.insert_customer(customer_data)
-            except Exception as e:
-                print(f"Error inserting customer {i+1}: {e}")
+        # Row by row insert on a single connection, committed in chunks
+        errors = Counter()
+        try:
+            with sql_conn.get_connection() as conn:
+                conn.autocommit = False
+                with conn.cursor() as cursor:
+                    for i, row in enumerate(customers):
+                        try:
+                            cursor.execute(CUSTOMER_INSERT, row)
+                            result = cursor.fetchone()
+                            if result:
+                                customer_ids.append(int(result[0]))
+                        except Exception as e:
+                            errors[type(e).__name__] += 1
+                        if (i + 1) % SQL_COMMIT_INTERVAL == 0:
+                            conn.commit()
+                conn.commit()
+        except Exception as e:
+            print(f"Error inserting customers: {e}")
+        print_error_summary(errors, "inserting customers")
         
-        print(f"✓ Generated {num_customers} customers")
+        print(f"✓ Generated {len(customer_ids)} customers")
+    
+    return customer_ids
 
 
 def generate_sql_product_data(sql_conn, num_products=20, bulk_insert=False):
     """Generate sample product data for SQL Database."""
     print(f"Generating {num_products} products...")
     
-    categories = {
-        'Electronics': ['Smartphones', 'Laptops', 'Tablets', 'Accessories'],
-        'Clothing': ['Men', 'Women', 'Kids', 'Accessories'],
-        'Home': ['Furniture', 'Decor', 'Kitchen', 'Bedding'],
-        'Sports': ['Fitness', 'Outdoor', 'Team Sports', 'Water Sports']
-    }
+    # Sample every column once
+    np_rng = seeded_rng('sql_products')
+    product_categories, product_subcategories = sample_categories(np_rng, num_products)
+    unit_prices = np_rng.uniform(10.0, 500.0, num_products).round(2).tolist()
+    stock_quantities = np_rng.integers(0, 201, num_products).tolist()
+    products = []
+    for i, (category, subcategory, unit_price, stock_quantity) in enumerate(
+        zip(product_categories, product_subcategories, unit_prices, stock_quantities)
+    ):
+        products.append((
+            f"{subcategory} Item {i+1}",
+            f"SKU-{i+1:05d}",
+            category,
+            subcategory,
+            unit_price,
+            stock_quantity
+        ))
     
     if bulk_insert:
-        # Generate all data first
-        products = []
-        for i in range(num_products):
-            category = random.choice(list(categories.keys()))
-            subcategory = random.choice(categories[category])
-            products.append((
-                f"{subcategory} Item {i+1}",
-                f"SKU-{i+1:05d}",
-                category,
-                subcategory,
-                round(random.uniform(10.0, 500.0), 2),
-                random.randint(0, 200)
-            ))
-        
         # Bulk insert
         try:
-            query = """
-            INSERT INTO ca.Products (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """
-            with sql_conn.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.executemany(query, products)
-                    conn.commit()
-            print(f"✓ Generated {num_products} products (bulk insert)")
+            inserted = bulk_insert_rows(sql_conn, "ca.Products", PRODUCT_COLUMNS, products, label="product")
+            print(f"✓ Generated {inserted} products (bulk insert)")
         except Exception as e:
             print(f"Error bulk inserting products: {e}")
     else:
-        # Row by row insert
-        for i in range(num_products):
-            category = random.choice(list(categories.keys()))
-            subcategory = random.choice(categories[category])
-            
-            product_name = f"{subcategory} Item {i+1}"
-            sku = f"SKU-{i+1:05d}"
-            unit_price = round(random.uniform(10.0, 500.0), 2)
-            stock_quantity = random.randint(0, 200)
-            
-            try:
-                query = """
-                INSERT INTO ca.Products (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """
-                with sql_conn.get_connection() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute(query, (
-                            product_name,
-                            sku,
-                            category,
-                            subcategory,
-                            unit_price,
-                            stock_quantity
-                        ))
-                        conn.commit()
-            except Exception as e:
-                print(f"Error inserting product {i+1}: {e}")
+        # Row by row insert on a single connection, committed in chunks
+        errors = Counter()
+        try:
+            with sql_conn.get_connection() as conn:
+                conn.autocommit = False
+                with conn.cursor() as cursor:
+                    for i, product in enumerate(products):
+                        try:
+                            cursor.execute(PRODUCT_INSERT, product)
+                        except Exception as e:
+                            errors[type(e).__name__] += 1
+                        if (i + 1) % SQL_COMMIT_INTERVAL == 0:
+                            conn.commit()
+                conn.commit()
+        except Exception as e:
+            print(f"Error inserting products: {e}")
+        print_error_summary(errors, "inserting products")
         
-        print(f"✓ Generated {num_products} products")
+        print(f"✓ Generated {num_products - sum(errors.values())} products")
 
 
 def generate_product_data(cosmos_conn, embedding_service, num_products=50):
     """Generate sample product data with embeddings for CosmosDB NoSQL."""
     print(f"Generating {num_products} products with embeddings...")
     
-    categories = {
-        'Electronics': ['Smartphones', 'Laptops', 'Tablets', 'Accessories'],
-        'Clothing': ['Men', 'Women', 'Kids', 'Accessories'],
-        'Home': ['Furniture', 'Decor', 'Kitchen', 'Bedding'],
-        'Sports': ['Fitness', 'Outdoor', 'Team Sports', 'Water Sports']
-    }
-    
-    brands = ['TechPro', 'StyleMax', 'HomeComfort', 'SportFit', 'Premium Choice']
+    # Every seeded product shares one timestamp
+    now_iso = datetime.utcnow().isoformat()
     
+    # Build all product attributes first so descriptions can be embedded in batches;
+    # numeric columns are sampled once and indexed per product
+    np_rng = seeded_rng('products')
+    product_categories, product_subcategories = sample_categories(np_rng, num_products)
+    product_brands = np_rng.choice(PRODUCT_BRANDS, num_products).tolist()
+    prices = np_rng.uniform(10.0, 500.0, num_products).round(2).tolist()
+    costs = np_rng.uniform(5.0, 250.0, num_products).round(2).tolist()
+    stocks = np_rng.integers(0, 101, num_products).tolist()
+    ratings = np_rng.uniform(3.0, 5.0, num_products).round(1).tolist()
+    review_counts = np_rng.integers(0, 501, num_products).tolist()
+    specs = []
     for i in range(num_products):
-        category = random.choice(list(categories.keys()))
-        subcategory = random.choice(categories[category])
-        brand = random.choice(brands)
-        
+        category = product_categories[i]
+        subcategory = product_subcategories[i]
+        brand = product_brands[i]
+        description = PRODUCT_DESCRIPTION_TEMPLATE.format(subcategory=subcategory.lower(), brand=brand)
+        specs.append((category, subcategory, brand, description))
+    
+    products = []
+    for i, (category, subcategory, brand, description) in enumerate(specs):
         product_name = f"{brand} {subcategory} Item {i+1}"
-        description = f"High-quality {subcategory.lower()} product from {brand}. " \
-                     f"Perfect for everyday use with excellent features and durability."
-        
-        # Generate embedding
-        try:
-            embedding = generate_embeddings([description], embedding_service)
-            if isinstance(embedding, list) and len(embedding) > 0:
-                embedding_vector = embedding[0] if isinstance(embedding[0], list) else embedding
-            else:
-                embedding_vector = embedding
-        except Exception as e:
-            print(f"Warning: Could not generate embedding for product {i+1}: {e}")
-            # Create a dummy embedding with 1536 dimensions (OpenAI ada-002 size)
-            embedding_vector = [0.0] * 1536
         
         product_data = {
             'id': f"product-{i+1:05d}",
@@ -193,205 +577,236 @@ def generate_product_data(cosmos_conn, embedding_service, num_products=50):
             'category': category,
             'subcategory': subcategory,
             'description': description,
-            'longDescription': description + " Features include premium materials, modern design, and reliable performance.",
-            'price': round(random.uniform(10.0, 500.0), 2),
-            'cost': round(random.uniform(5.0, 250.0), 2),
-            'stockQuantity': random.randint(0, 100),
+            'longDescription': f"{description}{LONG_DESCRIPTION_SUFFIX}",
+            'price': prices[i],
+            'cost': costs[i],
+            'stockQuantity': stocks[i],
             'isActive': True,
-            'rating': round(random.uniform(3.0, 5.0), 1),
-            'reviewCount': random.randint(0, 500),
-            'createdAt': datetime.utcnow().isoformat(),
-            'updatedAt': datetime.utcnow().isoformat()
+            'rating': ratings[i],
+            'reviewCount': review_counts[i],
+            'createdAt': now_iso,
+            'updatedAt': now_iso
         }
         
-        try:
-            cosmos_conn.create_product(product_data, embedding_vector)
-        except Exception as e:
-            print(f"Error inserting product {i+1}: {e}")
+        products.append(product_data)
     
-    print(f"✓ Generated {num_products} products with embeddings")
+    try:
+        created = embed_and_write(
+            products, [spec[3] for spec in specs], embedding_service, cosmos_conn.create_products_bulk, label="product"
+        )
+    except Exception as e:
+        print(f"Error bulk inserting products: {e}")
+        created = 0
+    
+    print(f"✓ Generated {created} products with embeddings")
 
 
-def generate_order_data(sql_conn, num_orders=500, bulk_insert=False):
-    """Generate sample order data."""
+def generate_order_data(sql_conn, num_orders=500, bulk_insert=False, customer_ids=None):
+    """
+    Generate sample order data.
+    
+    customer_ids, when given (e.g. from generate_customer_data), skips the
+    lookup of existing customers. Returns the new OrderIDs when inserting
+    row by row, or None for bulk inserts.
+    """
     print(f"Generating {num_orders} orders...")
     
-    # First, get list of actual customer IDs from database
-    customer_ids = []
-    try:
-        with sql_conn.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT CustomerID FROM ca.Customers")
-                customer_ids = [row[0] for row in cursor.fetchall()]
-    except Exception as e:
-        print(f"Error fetching customer IDs: {e}")
-        return
+    # Otherwise, sample actual customer IDs from the database; more than
+    # num_orders distinct IDs could never all be used
+    if not customer_ids:
+        try:
+            with sql_conn.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT TOP (?) CustomerID FROM ca.Customers ORDER BY NEWID()", (num_orders,))
+                    customer_ids = [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error fetching customer IDs: {e}")
+            return
     
     if not customer_ids:
         print("No customers found in database. Please run generate_customer_data first.")
         return
     
-    order_statuses = ['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled']
+    # Sample every column at once; tolist() hands native Python types to the driver
+    np_rng = seeded_rng('orders')
+    now = datetime.now()
+    order_customers = np_rng.choice(customer_ids, num_orders).tolist()
+    order_ages = np_rng.integers(0, 366, num_orders).tolist()
+    order_amounts = np_rng.uniform(20.0, 1000.0, num_orders).round(2).tolist()
+    order_status_values = np_rng.choice(ORDER_STATUSES, num_orders).tolist()
+    # A generator, so the insert paths pull tuples as they send them
+    # Only 366 distinct order dates exist, so build each datetime once
+    order_dates = [now - timedelta(days=age) for age in range(366)]
+    orders = (
+        (int(customer_id), order_dates[age], amount, status)
+        for customer_id, age, amount, status in zip(
+            order_customers, order_ages, order_amounts, order_status_values
+        )
+    )
     
     if bulk_insert:
-        # Generate all data first
-        orders = []
-        for i in range(num_orders):
-            customer_id = random.choice(customer_ids)
-            order_date = datetime.now() - timedelta(days=random.randint(0, 365))
-            total_amount = round(random.uniform(20.0, 1000.0), 2)
-            order_status = random.choice(order_statuses)
-            orders.append((customer_id, order_date, total_amount, order_status))
-        
         # Bulk insert
         try:
-            query = """
-            INSERT INTO ca.Orders (CustomerID, OrderDate, TotalAmount, OrderStatus)
-            VALUES (?, ?, ?, ?)
-            """
-            with sql_conn.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.executemany(query, orders)
-                    conn.commit()
-            print(f"✓ Generated {num_orders} orders (bulk insert)")
+            with bulk_load_mode(sql_conn, "ca.Orders"):
+                inserted = bulk_insert_rows(sql_conn, "ca.Orders", ORDER_COLUMNS, orders, label="order")
+            print(f"✓ Generated {inserted} orders (bulk insert)")
         except Exception as e:
             print(f"Error bulk inserting orders: {e}")
     else:
-        # Row by row insert
-        for i in range(num_orders):
-            customer_id = random.choice(customer_ids)  # Use actual customer IDs
-            order_date = datetime.now() - timedelta(days=random.randint(0, 365))
-            
-            # Generate random order amount
-            total_amount = round(random.uniform(20.0, 1000.0), 2)
-            
-            order_data = {
-                'customer_id': customer_id,
-                'order_date': order_date,
-                'total_amount': total_amount,
-                'order_status': random.choice(order_statuses)
-            }
-            
-            try:
-                # Insert order into database
-                query = """
-                INSERT INTO ca.Orders (CustomerID, OrderDate, TotalAmount, OrderStatus)
-                VALUES (?, ?, ?, ?)
-                """
-                with sql_conn.get_connection() as conn:
-                    with conn.cursor() as cursor:
-                        cursor.execute(query, (
-                            order_data['customer_id'],
-                            order_data['order_date'],
-                            order_data['total_amount'],
-                            order_data['order_status']
-                        ))
-                        conn.commit()
-            except Exception as e:
-                print(f"Error inserting order {i+1}: {e}")
+        # Row by row insert on a single connection, committed in chunks
+        order_ids = []
+        errors = Counter()
+        try:
+            with sql_conn.get_connection() as conn:
+                conn.autocommit = False
+                with conn.cursor() as cursor:
+                    for i, order in enumerate(orders):
+                        try:
+                            cursor.execute(ORDER_INSERT, order)
+                            result = cursor.fetchone()
+                            if result:
+                                order_ids.append(int(result[0]))
+                        except Exception as e:
+                            errors[type(e).__name__] += 1
+                        if (i + 1) % SQL_COMMIT_INTERVAL == 0:
+                            conn.commit()
+                conn.commit()
+        except Exception as e:
+            print(f"Error inserting orders: {e}")
+        print_error_summary(errors, "inserting orders")
         
-        print(f"✓ Generated {num_orders} orders")
+        print(f"✓ Generated {len(order_ids)} orders")
+        return order_ids
 
 
-def generate_order_items_data(sql_conn, num_items_per_order=None, bulk_insert=False):
-    """Generate sample order items data."""
-    print(f"Generating order items...")
-    
-    # Get all orders
+# Server-side order item generation: every order gets 1-5 (or a fixed number
+# of) distinct random products, with the same quantity and discount mix as
+# the client-side generator. The discount bucket is looked up in a string so
+# NEWID() appears once: a CASE (or CHOOSE, which expands to CASE) re-runs it
+# for every WHEN and skews the mix towards 0%
+ORDER_ITEMS_INSERT_SELECT = """
+INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice, Discount)
+SELECT
+    o.OrderID,
+    p.ProductID,
+    1 + ABS(CHECKSUM(NEWID())) % 3,
+    p.UnitPrice,
+    5.0 * CAST(SUBSTRING('000123', 1 + ABS(CHECKSUM(NEWID())) % 6, 1) AS INT)
+FROM (
+    SELECT OrderID, COALESCE(?, 1 + ABS(CHECKSUM(NEWID())) % 5) AS ItemCount
+    FROM ca.Orders
+) o
+CROSS APPLY (
+    SELECT TOP (o.ItemCount) ProductID, UnitPrice
+    FROM ca.Products
+    ORDER BY CHECKSUM(NEWID(), o.OrderID)
+) p
+"""
+
+
+def refresh_customer_lifetime_values(sql_conn, customer_ids=None):
+    """
+    Recompute TotalLifetimeValue (and with it the computed CustomerSegment)
+    in one call, for customer_ids or, when not given, every customer with orders.
+    """
     try:
-        with sql_conn.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT OrderID FROM ca.Orders")
-                order_ids = [row[0] for row in cursor.fetchall()]
+        if not customer_ids:
+            customer_ids = sql_conn.fetch_scalars("SELECT DISTINCT CustomerID FROM ca.Orders")
+        sql_conn.update_customer_lifetime_values(customer_ids)
+        print(f"✓ Updated lifetime values for {len(customer_ids)} customers")
     except Exception as e:
-        print(f"Error fetching order IDs: {e}")
-        return
+        print(f"Error updating customer lifetime values: {e}")
+
+
+def generate_order_items_data(sql_conn, num_items_per_order=None, bulk_insert=False, order_ids=None):
+    """
+    Generate sample order items data.
     
-    if not order_ids:
-        print("No orders found in database. Please run generate_order_data first.")
-        return
+    order_ids, when given (e.g. from generate_order_data), limits the row by
+    row path to those orders and skips the lookup of existing orders.
+    """
+    print(f"Generating order items...")
+    
+    if bulk_insert:
+        # Let SQL pair orders with products in one statement instead of
+        # pulling both tables into Python
+        try:
+            with bulk_load_mode(sql_conn, "ca.OrderItems"):
+                inserted = sql_conn.execute_non_query(ORDER_ITEMS_INSERT_SELECT, (num_items_per_order,))
+            print(f"✓ Generated {inserted} order items (bulk insert)")
+            return
+        except Exception as e:
+            print(f"Warning: Server-side order item insert failed, generating rows locally: {e}")
     
-    # Get all products
+    # Get the orders (unless given) and all products on one connection
     try:
         with sql_conn.get_connection() as conn:
             with conn.cursor() as cursor:
+                if not order_ids:
+                    cursor.execute("SELECT OrderID FROM ca.Orders")
+                    order_ids = [row[0] for row in cursor.fetchall()]
                 cursor.execute("SELECT ProductID, UnitPrice FROM ca.Products")
                 products = cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching products: {e}")
+        print(f"Error fetching orders and products: {e}")
+        return
+    
+    if not order_ids:
+        print("No orders found in database. Please run generate_order_data first.")
         return
     
     if not products:
         print("No products found in database. Please run generate_sql_product_data first.")
         return
     
+    np_rng = seeded_rng('order_items')
+    
+    # Item counts (1-5 per order), the distinct products of each order,
+    # quantities and discounts are all drawn as whole columns
+    num_orders = len(order_ids)
+    if num_items_per_order:
+        item_counts = np.full(num_orders, min(num_items_per_order, len(products)))
+    else:
+        item_counts = np.minimum(np_rng.integers(1, 6, num_orders), len(products))
+    picks = sample_distinct_indices(np_rng, len(products), item_counts)
+    total = len(picks)
+    item_orders = np.repeat(np.asarray(order_ids, dtype=np.int64), item_counts).tolist()
+    item_products = np.asarray([int(product_id) for product_id, _ in products], dtype=np.int64)[picks].tolist()
+    item_prices = np.asarray([float(unit_price) for _, unit_price in products])[picks].tolist()
+    quantities = np_rng.integers(1, 4, total).tolist()
+    discounts = np_rng.choice([0.0, 0.0, 0.0, 5.0, 10.0, 15.0], total).tolist()  # Mostly no discount
+    # Ensure proper types: int, int, int, float, float; a generator, so the
+    # insert paths pull tuples as they send them
+    order_items = zip(item_orders, item_products, quantities, item_prices, discounts)
+    
     if bulk_insert:
-        # Generate all data first
-        order_items = []
-        for order_id in order_ids:
-            # Random number of items per order (1-5)
-            num_items = num_items_per_order if num_items_per_order else random.randint(1, 5)
-            
-            # Select random products for this order
-            selected_products = random.sample(products, min(num_items, len(products)))
-            
-            for product_id, unit_price in selected_products:
-                quantity = random.randint(1, 3)
-                discount = random.choice([0.0, 0.0, 0.0, 5.0, 10.0, 15.0])  # Mostly no discount
-                # Ensure proper types: int, int, int, float, float
-                order_items.append((
-                    int(order_id), 
-                    int(product_id), 
-                    quantity, 
-                    float(unit_price), 
-                    discount
-                ))
-        
         # Bulk insert
         try:
-            query = """
-            INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice, Discount)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            with sql_conn.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.executemany(query, order_items)
-                    conn.commit()
-            print(f"✓ Generated {len(order_items)} order items (bulk insert)")
+            with bulk_load_mode(sql_conn, "ca.OrderItems"):
+                inserted = bulk_insert_rows(sql_conn, "ca.OrderItems", ORDER_ITEM_COLUMNS, order_items, label="order item")
+            print(f"✓ Generated {inserted} order items (bulk insert)")
         except Exception as e:
             print(f"Error bulk inserting order items: {e}")
     else:
-        # Row by row insert
+        # Row by row insert on a single connection, committed in chunks
         total_items = 0
-        for order_id in order_ids:
-            # Random number of items per order (1-5)
-            num_items = num_items_per_order if num_items_per_order else random.randint(1, 5)
-            
-            # Select random products for this order
-            selected_products = random.sample(products, min(num_items, len(products)))
-            
-            for product_id, unit_price in selected_products:
-                quantity = random.randint(1, 3)
-                discount = random.choice([0.0, 0.0, 0.0, 5.0, 10.0, 15.0])  # Mostly no discount
-                
-                try:
-                    query = """
-                    INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice, Discount)
-                    VALUES (?, ?, ?, ?, ?)
-                    """
-                    with sql_conn.get_connection() as conn:
-                        with conn.cursor() as cursor:
-                            cursor.execute(query, (
-                                int(order_id),
-                                int(product_id),
-                                quantity,
-                                float(unit_price),
-                                discount
-                            ))
-                            conn.commit()
-                    total_items += 1
-                except Exception as e:
-                    print(f"Error inserting order item for order {order_id}: {e}")
+        errors = Counter()
+        try:
+            with sql_conn.get_connection() as conn:
+                conn.autocommit = False
+                with conn.cursor() as cursor:
+                    for item in order_items:
+                        try:
+                            cursor.execute(ORDER_ITEM_INSERT, item)
+                            total_items += 1
+                            if total_items % SQL_COMMIT_INTERVAL == 0:
+                                conn.commit()
+                        except Exception as e:
+                            errors[type(e).__name__] += 1
+                conn.commit()
+        except Exception as e:
+            print(f"Error inserting order items: {e}")
+        print_error_summary(errors, "inserting order items")
         
         print(f"✓ Generated {total_items} order items")
 
@@ -400,30 +815,8 @@ def generate_review_data(cosmos_conn, embedding_service, num_reviews=200):
     """Generate sample product review data for CosmosDB NoSQL."""
     print(f"Generating {num_reviews} reviews...")
     
-    sentiment_labels = ['positive', 'neutral', 'negative']
-    review_templates = {
-        'positive': [
-            "Excellent product! Highly recommend.",
-            "Great quality and fast shipping. Very satisfied!",
-            "Amazing! Exceeded my expectations.",
-            "Perfect! Exactly what I needed.",
-            "Love it! Will definitely buy again."
-        ],
-        'neutral': [
-            "It's okay. Does the job but nothing special.",
-            "Decent product for the price.",
-            "Average quality. Met expectations.",
-            "Not bad, not great. It's fine.",
-            "Works as expected."
-        ],
-        'negative': [
-            "Disappointed. Not as described.",
-            "Poor quality. Would not recommend.",
-            "Broke after a few uses. Waste of money.",
-            "Not satisfied with this purchase.",
-            "Below expectations. Returning it."
-        ]
-    }
+    now = datetime.now()
+    now_iso = datetime.utcnow().isoformat()
     
     # Get product IDs from CosmosDB
     try:
@@ -438,102 +831,109 @@ def generate_review_data(cosmos_conn, embedding_service, num_reviews=200):
         print("⚠️  No products found. Please generate products first.")
         return
     
-    for i in range(num_reviews):
-        product_id = random.choice(product_ids)
-        customer_id = random.randint(1, 100)  # Assuming 100 customers
-        
-        # Determine sentiment and rating
-        sentiment = random.choice(sentiment_labels)
-        if sentiment == 'positive':
-            rating = random.randint(4, 5)
-            sentiment_score = round(random.uniform(0.5, 1.0), 2)
-        elif sentiment == 'neutral':
-            rating = 3
-            sentiment_score = round(random.uniform(-0.3, 0.3), 2)
-        else:  # negative
-            rating = random.randint(1, 2)
-            sentiment_score = round(random.uniform(-1.0, -0.5), 2)
-        
-        review_text = random.choice(review_templates[sentiment])
-        review_date = datetime.now() - timedelta(days=random.randint(0, 180))
-        verified_purchase = random.choice([True, False])
-        
-        # Generate embedding for review text
-        try:
-            embedding = generate_embeddings([review_text], embedding_service)
-            if isinstance(embedding, list) and len(embedding) > 0:
-                embedding_vector = embedding[0] if isinstance(embedding[0], list) else embedding
-            else:
-                embedding_vector = embedding
-        except Exception as e:
-            print(f"Warning: Could not generate embedding for review {i+1}: {e}")
-            # Create a dummy embedding with 1536 dimensions (OpenAI ada-002 size)
-            embedding_vector = [0.0] * 1536
-        
-        review_data = {
-            'id': f"review-{i+1:05d}",
-            'reviewId': f"review-{i+1:05d}",
-            'productId': product_id,
-            'customerId': str(customer_id),
-            'rating': rating,
-            'reviewText': review_text,
-            'reviewDate': review_date.isoformat(),
-            'verifiedPurchase': verified_purchase,
-            'sentimentLabel': sentiment,
-            'sentimentScore': sentiment_score,
-            'helpfulCount': random.randint(0, 50),
-            'createdAt': datetime.utcnow().isoformat()
-        }
-        
-        try:
-            cosmos_conn.create_review(review_data, embedding_vector)
-        except Exception as e:
-            print(f"Error inserting review {i+1}: {e}")
+    # Sample the categorical columns once; reviews skew positive like real catalogs
+    np_rng = seeded_rng('reviews')
+    review_products = np_rng.choice(product_ids, num_reviews).tolist()
+    sentiment_idx = np_rng.choice(len(REVIEW_SENTIMENTS), num_reviews, p=[0.5, 0.25, 0.25])
+    review_sentiments = np.array(REVIEW_SENTIMENTS)[sentiment_idx].tolist()
+    review_verified = np_rng.choice([True, False], num_reviews).tolist()
     
-    print(f"✓ Generated {num_reviews} product reviews")
+    # Stage reviews column-wise so the texts can be embedded in batches;
+    # dicts are only materialized for the Cosmos payload
+    review_ids = [f"review-{i+1:05d}" for i in range(num_reviews)]
+    review_customers = [str(c) for c in np_rng.integers(1, 101, num_reviews).tolist()]  # Assuming 100 customers
+    # Rating range and score range follow the sentiment (positive, neutral, negative)
+    rating_low, rating_high = np.array([4, 3, 1]), np.array([5, 3, 2])
+    score_low, score_high = np.array([0.5, -0.3, -1.0]), np.array([1.0, 0.3, -0.5])
+    review_ratings = np_rng.integers(rating_low[sentiment_idx], rating_high[sentiment_idx] + 1).tolist()
+    review_scores = np_rng.uniform(score_low[sentiment_idx], score_high[sentiment_idx]).round(2).tolist()
+    template_idx = np_rng.integers(0, REVIEW_TEMPLATE_TABLE.shape[1], num_reviews)
+    review_texts = REVIEW_TEMPLATE_TABLE[sentiment_idx, template_idx].tolist()
+    review_dates = [(now - timedelta(days=d)).isoformat() for d in np_rng.integers(0, 181, num_reviews).tolist()]
+    helpful_counts = np_rng.integers(0, 51, num_reviews).tolist()
+    
+    review_keys = (
+        'id', 'reviewId', 'productId', 'customerId', 'rating', 'reviewText', 'reviewDate',
+        'verifiedPurchase', 'sentimentLabel', 'sentimentScore', 'helpfulCount', 'createdAt'
+    )
+    reviews = [
+        dict(zip(review_keys, row))
+        for row in zip(
+            review_ids, review_ids, review_products, review_customers, review_ratings,
+            review_texts, review_dates, review_verified, review_sentiments, review_scores,
+            helpful_counts, repeat(now_iso)
+        )
+    ]
+    
+    try:
+        created = embed_and_write(reviews, review_texts, embedding_service, cosmos_conn.create_reviews_bulk, label="review")
+    except Exception as e:
+        print(f"Error bulk inserting reviews: {e}")
+        created = 0
+    
+    print(f"✓ Generated {created} product reviews")
 
 
 def generate_session_data(cosmos_conn, num_sessions=50):
     """Generate sample session data."""
     print(f"Generating {num_sessions} sessions...")
     
-    pages = ['/home', '/products', '/cart', '/checkout', '/account']
+    base = datetime.utcnow()
+    
+    # Sample the categorical columns once
+    np_rng = seeded_rng('sessions')
+    session_customers = [str(c) for c in np_rng.integers(1, 101, num_sessions).tolist()]
+    durations = np_rng.integers(60, 3601, num_sessions).tolist()
+    landing_pages = np_rng.choice(SESSION_PAGES, num_sessions).tolist()
+    device_types = np_rng.choice(DEVICE_TYPES, num_sessions).tolist()
+    browsers = np_rng.choice(BROWSERS, num_sessions).tolist()
     
+    # Sample every event of every session at once; session i owns the slice
+    # event_bounds[i]:event_bounds[i + 1] of the flat event columns
+    events_per_session = np_rng.integers(3, 11, num_sessions)
+    event_bounds = np.concatenate(([0], np.cumsum(events_per_session))).tolist()
+    total_events = event_bounds[-1]
+    event_types = np_rng.choice(SESSION_EVENT_TYPES, total_events).tolist()
+    event_pages = np_rng.choice(SESSION_PAGES, total_events).tolist()
+    # Only 61 distinct minute offsets exist, so format each timestamp once
+    minute_stamps = [(base - timedelta(minutes=m)).isoformat() for m in range(61)]
+    event_stamps = [minute_stamps[m] for m in np_rng.integers(0, 61, total_events).tolist()]
+    # Likewise for the 31 possible session start days
+    day_stamps = [(base - timedelta(days=d)).isoformat() for d in range(31)]
+    start_stamps = [day_stamps[d] for d in np_rng.integers(0, 31, num_sessions).tolist()]
+    # Build every event dict in one pass; sessions take slices of this list
+    events = [
+        {'eventType': event_type, 'timestamp': timestamp, 'page': page}
+        for event_type, timestamp, page in zip(event_types, event_stamps, event_pages)
+    ]
+    
+    sessions = []
     for i in range(num_sessions):
-        customer_id = random.randint(1, 100)
-        session_id = f"session-{fake.uuid4()}"
+        session_id = f"session-{uuid.uuid4().hex}"
+        first, last = event_bounds[i], event_bounds[i + 1]
         
         session_data = {
             'id': session_id,
             'sessionId': session_id,
-            'customerId': str(customer_id),
-            'startTime': (datetime.utcnow() - timedelta(days=random.randint(0, 30))).isoformat(),
-            'landingPage': random.choice(pages),
+            'customerId': session_customers[i],
+            'startTime': start_stamps[i],
+            'landingPage': landing_pages[i],
             'status': 'completed',
-            'deviceType': random.choice(['desktop', 'mobile', 'tablet']),
-            'browser': random.choice(['Chrome', 'Firefox', 'Safari', 'Edge']),
-            'duration': random.randint(60, 3600),
-            'events': []
+            'deviceType': device_types[i],
+            'browser': browsers[i],
+            'duration': durations[i],
+            'events': events[first:last],
+            'eventCount': last - first
         }
-        
-        # Add some events
-        num_events = random.randint(3, 10)
-        for j in range(num_events):
-            event = {
-                'eventType': random.choice(['pageView', 'productView', 'addToCart', 'search']),
-                'timestamp': (datetime.utcnow() - timedelta(minutes=random.randint(0, 60))).isoformat(),
-                'page': random.choice(pages)
-            }
-            session_data['events'].append(event)
-        
-        session_data['eventCount'] = num_events
-        
-        try:
-            cosmos_conn.create_session(session_data)
-        except Exception as e:
-            print(f"Error inserting session {i+1}: {e}")
+        sessions.append(session_data)
     
-    print(f"✓ Generated {num_sessions} sessions")
+    try:
+        created = cosmos_conn.create_sessions_bulk(sessions)
+    except Exception as e:
+        print(f"Error bulk inserting sessions: {e}")
+        created = 0
+    
+    print(f"✓ Generated {created} sessions")
 
 
 def truncate_sql_table(sql_conn, table_name):
@@ -567,32 +967,66 @@ def truncate_sql_table(sql_conn, table_name):
 def truncate_cosmos_container(cosmos_conn, container_name):
     """Delete all items from a CosmosDB container."""
     try:
-        container = None
-        if container_name.lower() == 'products':
-            container = cosmos_conn.products_container
-        elif container_name.lower() == 'reviews':
-            container = cosmos_conn.reviews_container
-        elif container_name.lower() == 'sessions':
-            container = cosmos_conn.container
-        
-        if not container:
+        if container_name.lower() not in COSMOS_PARTITION_KEYS:
             print(f"  ❌ Unknown container: {container_name}")
             return False
+        attribute, partition_key_field = COSMOS_PARTITION_KEYS[container_name.lower()]
+        container = getattr(cosmos_conn, attribute)
         
-        # Query all items
-        items = list(container.query_items(
-            query="SELECT c.id, c._partitionKey FROM c",
-            enable_cross_partition_query=True
-        ))
+        # Dropping and recreating the container is cheapest, but needs
+        # container management rights
+        try:
+            cosmos_conn.recreate_container(container)
+            print(f"  ✓ Cleared {container_name} container (recreated)")
+            return True
+        except Exception as e:
+            print(f"  Container recreate unavailable, deleting items instead: {e}")
         
-        print(f"  Deleting {len(items)} items from {container_name}...")
-        for item in items:
+        # One background delete per partition key, where the SDK and account support it
+        if hasattr(container, 'delete_all_items_by_partition_key'):
+            partition_keys = list(container.query_items(
+                query=f"SELECT DISTINCT VALUE c.{partition_key_field} FROM c",
+                enable_cross_partition_query=True
+            ))
+            print(f"  Deleting {len(partition_keys)} partitions from {container_name}...")
             try:
-                container.delete_item(item=item['id'], partition_key=item.get('_partitionKey'))
-            except:
-                pass  # Item might already be deleted
+                with ThreadPoolExecutor(max_workers=COSMOS_DELETE_WORKERS) as executor:
+                    list(executor.map(container.delete_all_items_by_partition_key, partition_keys))
+                print(f"  ✓ Cleared {container_name} container (deletes finish in the background)")
+                return True
+            except Exception as e:
+                print(f"  Partition delete unavailable, deleting item by item: {e}")
+        
+        def delete_page(page):
+            deleted = 0
+            for item in page:
+                try:
+                    container.delete_item(item=item['id'], partition_key=item.get('pk'))
+                    deleted += 1
+                except Exception:
+                    pass  # Item might already be deleted
+            return deleted
         
-        print(f"  ✓ Cleared {container_name} container")
+        # Stream ids page by page and delete each page while the next one is fetched
+        print(f"  Deleting items from {container_name}...")
+        items = container.query_items(
+            query=f"SELECT c.id, c.{partition_key_field} AS pk FROM c",
+            enable_cross_partition_query=True,
+            max_item_count=COSMOS_DELETE_PAGE_SIZE
+        )
+        deleted = 0
+        with ThreadPoolExecutor(max_workers=COSMOS_DELETE_WORKERS) as executor:
+            # At most COSMOS_DELETE_WORKERS pages are held at once: the next
+            # page is only fetched after one in flight finishes
+            pending = set()
+            for page in items.by_page():
+                if len(pending) >= COSMOS_DELETE_WORKERS:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    deleted += sum(future.result() for future in done)
+                pending.add(executor.submit(delete_page, list(page)))
+            deleted += sum(future.result() for future in pending)
+        
+        print(f"  ✓ Cleared {container_name} container ({deleted} items)")
         return True
     except Exception as e:
         print(f"  ❌ Error clearing {container_name}: {e}")
@@ -637,16 +1071,28 @@ def get_yes_no(prompt):
 
 def main():
     """Main function to generate sample data with interactive options."""
-    print("=" * 70)
+    parser = argparse.ArgumentParser(description="Generate sample data for the Customer Analytics Platform.")
+    parser.add_argument(
+        "--fake-embeddings",
+        action="store_true",
+        help="Use random unit vectors instead of calling the embeddings API (dev/test data only)"
+    )
+    args = parser.parse_args()
+    
+    log_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS)
+    log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.WARNING, handlers=[log_handler])
+    
+    print(_BAR70)
     print("Sample Data Generator for Customer Analytics Platform")
     print("Microsoft Fabric SQL Database + Fabric CosmosDB NoSQL")
-    print("=" * 70)
+    print(_BAR70)
     
     # =========================================================================
     # INTERACTIVE MODE SELECTION
     # =========================================================================
     print("\n📋 SELECT TABLES/CONTAINERS TO LOAD")
-    print("-" * 70)
+    print(_RULE70)
     
     tables_options = [
         "Load ALL tables and containers",
@@ -702,14 +1148,14 @@ def main():
     # TRUNCATE SELECTION
     # =========================================================================
     print("\n🗑️ TRUNCATE TABLES/CONTAINERS?")
-    print("-" * 70)
+    print(_RULE70)
     truncate_first = get_yes_no("Clear existing data before loading?")
     
     # =========================================================================
     # INSERT MODE SELECTION
     # =========================================================================
     print("\n⚙️ SELECT INSERT MODE")
-    print("-" * 70)
+    print(_RULE70)
     
     insert_modes = [
         "Row by row insert (slower, better error handling)",
@@ -726,7 +1172,7 @@ def main():
     # RECORD COUNT CONFIGURATION
     # =========================================================================
     print("\n🔢 CONFIGURE RECORD COUNTS")
-    print("-" * 70)
+    print(_RULE70)
     
     # Initialize all counts
     num_customers = 100
@@ -779,9 +1225,9 @@ def main():
     # =========================================================================
     # CONFIRMATION
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("📋 CONFIGURATION SUMMARY")
-    print("=" * 70)
+    print(_BAR70)
     print(f"\nTruncate First: {'Yes' if truncate_first else 'No'}")
     print(f"Insert Mode: {'Bulk Insert' if bulk_insert else 'Row by Row'}")
     print("\nTables/Containers to load:")
@@ -807,9 +1253,9 @@ def main():
     # =========================================================================
     # INITIALIZE CONNECTIONS
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("📡 INITIALIZING DATABASE CONNECTIONS")
-    print("=" * 70)
+    print(_BAR70)
     
     sql_conn = None
     cosmos_conn = None
@@ -836,7 +1282,9 @@ def main():
             cosmos_conn.initialize()
             print("✓ Fabric CosmosDB NoSQL connected")
         
-        if load_cosmos_products or load_cosmos_reviews:
+        if (load_cosmos_products or load_cosmos_reviews) and args.fake_embeddings:
+            print("✓ Using random embeddings (--fake-embeddings)")
+        elif load_cosmos_products or load_cosmos_reviews:
             embedding_service = get_embedding_service(use_azure=True)
             print("✓ Embedding service initialized")
         
@@ -850,9 +1298,9 @@ def main():
     # TRUNCATE TABLES IF REQUESTED
     # =========================================================================
     if truncate_first:
-        print("\n" + "=" * 70)
+        print("\n" + _BAR70)
         print("🗑️  TRUNCATING TABLES/CONTAINERS")
-        print("=" * 70)
+        print(_BAR70)
         
         if load_sql_customers and sql_conn:
             truncate_sql_table(sql_conn, "ca.Customers")
@@ -872,51 +1320,93 @@ def main():
     # =========================================================================
     # GENERATE DATA
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("📊 GENERATING SAMPLE DATA")
-    print("=" * 70)
+    print(_BAR70)
     
-    try:
-        if load_sql_customers and sql_conn:
-            print(f"\nGenerating Customers...")
-            generate_customer_data(sql_conn, num_customers=num_customers, bulk_insert=bulk_insert)
-        
-        if load_sql_products and sql_conn:
-            print(f"\nGenerating SQL Products...")
-            generate_sql_product_data(sql_conn, num_products=num_sql_products, bulk_insert=bulk_insert)
+    # SQL, the Cosmos catalog and Cosmos sessions share no data, so each
+    # dependency chain runs on its own thread to overlap the network waits
+    def generate_sql_data():
+        customer_ids = None
+        order_ids = None
+        # Customers and products are independent, so products load alongside
+        # customers; orders need the customers, order items both
+        with ThreadPoolExecutor(max_workers=1) as product_executor:
+            products_done = None
+            if load_sql_products:
+                print(f"\nGenerating SQL Products...")
+                products_done = product_executor.submit(
+                    generate_sql_product_data, sql_conn, num_products=num_sql_products, bulk_insert=bulk_insert
+                )
+            
+            if load_sql_customers:
+                print(f"\nGenerating Customers...")
+                customer_ids = generate_customer_data(sql_conn, num_customers=num_customers, bulk_insert=bulk_insert)
+            
+            if products_done:
+                products_done.result()
         
-        if load_sql_orders and sql_conn:
+        if load_sql_orders:
             print(f"\nGenerating Orders...")
-            generate_order_data(sql_conn, num_orders=num_orders, bulk_insert=bulk_insert)
+            order_ids = generate_order_data(sql_conn, num_orders=num_orders, bulk_insert=bulk_insert, customer_ids=customer_ids)
         
-        if load_sql_order_items and sql_conn:
+        if load_sql_order_items:
             print(f"\nGenerating Order Items...")
-            generate_order_items_data(sql_conn, bulk_insert=bulk_insert)
+            generate_order_items_data(sql_conn, bulk_insert=bulk_insert, order_ids=order_ids)
         
-        if load_cosmos_products and cosmos_conn and embedding_service:
+        if load_sql_orders or load_sql_order_items:
+            print(f"\nUpdating Customer Lifetime Values...")
+            refresh_customer_lifetime_values(sql_conn, customer_ids)
+    
+    def generate_cosmos_catalog_data():
+        # Reviews reference the products, so they run after them
+        if load_cosmos_products:
             print(f"\nGenerating CosmosDB Products...")
             generate_product_data(cosmos_conn, embedding_service, num_products=num_cosmos_products)
         
-        if load_cosmos_reviews and cosmos_conn and embedding_service:
+        if load_cosmos_reviews:
             print(f"\nGenerating Reviews...")
             generate_review_data(cosmos_conn, embedding_service, num_reviews=num_reviews)
-        
-        if load_cosmos_sessions and cosmos_conn:
-            print(f"\nGenerating Sessions...")
-            generate_session_data(cosmos_conn, num_sessions=num_sessions)
-        
-    except Exception as e:
-        print(f"\n❌ Error generating data: {e}")
-        import traceback
-        traceback.print_exc()
+    
+    def generate_cosmos_session_data():
+        print(f"\nGenerating Sessions...")
+        generate_session_data(cosmos_conn, num_sessions=num_sessions)
+    
+    jobs = {}
+    if sql_conn and (load_sql_customers or load_sql_products or load_sql_orders or load_sql_order_items):
+        jobs["SQL"] = generate_sql_data
+    if cosmos_conn and (embedding_service or args.fake_embeddings) and (load_cosmos_products or load_cosmos_reviews):
+        jobs["CosmosDB catalog"] = generate_cosmos_catalog_data
+    if cosmos_conn and load_cosmos_sessions:
+        jobs["CosmosDB sessions"] = generate_cosmos_session_data
+    
+    failed = False
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as executor:
+        futures = {executor.submit(job): name for name, job in jobs.items()}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"\n❌ Error generating {futures[future]} data: {e}")
+                import traceback
+                traceback.print_exc()
+                failed = True
+    
+    # Every phase checked its connections out of the same pool; close them
+    # once, after the last phase
+    if sql_conn:
+        sql_conn.close()
+    close_embedding_service()
+    
+    if failed:
         return
     
     # =========================================================================
     # SUMMARY
     # =========================================================================
-    print("\n" + "=" * 70)
+    print("\n" + _BAR70)
     print("✅ SAMPLE DATA GENERATION COMPLETED!")
-    print("=" * 70)
+    print(_BAR70)
     print("\nGenerated:")
     if load_sql_customers:
         print(f"  ✓ SQL Customers: {num_customers} records")
@@ -936,7 +1426,7 @@ def main():
     print("\n💡 Next Steps:")
     print("  • Run: python scripts/database_summary.py  (to verify data)")
     print("  • Run: streamlit run Home.py  (to launch the application)")
-    print("=" * 70)
+    print(_BAR70)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@ import sys
 import os
 from datetime import datetime, timedelta
 import random
+from itertools import accumulate, islice
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from faker import Faker
 import json
 
@@ -24,58 +27,201 @@ from src.database.fabric_sql import FabricSQLConnector
 from src.database.fabric_cosmos import FabricCosmosDBConnector
 from src.agent_integration import get_embedding_service, generate_embeddings
 
+_BAR60 = "=" * 60
+_BAR70 = "=" * 70
+
+# Customer rows generated and inserted per transaction
+SQL_CHUNK_ROWS = 5000
+# Distinct names/countries/cities generated by Faker for customer rows
+FAKER_POOL_SIZE = 50
+
+# Product catalog seeded into ca.Products
+SAMPLE_PRODUCTS = [
+    ("Laptop Pro 15", "SKU-001", "Electronics", "Computers", 1299.99, 50),
+    ("Wireless Mouse", "SKU-002", "Electronics", "Accessories", 29.99, 150),
+    ("USB-C Hub", "SKU-003", "Electronics", "Accessories", 49.99, 200),
+    ("4K Monitor", "SKU-004", "Electronics", "Displays", 399.99, 75),
+    ("Mechanical Keyboard", "SKU-005", "Electronics", "Accessories", 129.99, 100),
+    ("Noise-Canceling Headphones", "SKU-006", "Electronics", "Audio", 249.99, 60),
+    ("Portable SSD 1TB", "SKU-007", "Electronics", "Storage", 119.99, 120),
+    ("Webcam HD", "SKU-008", "Electronics", "Accessories", 79.99, 90),
+    ("Standing Desk", "SKU-009", "Furniture", "Office", 499.99, 30),
+    ("Ergonomic Chair", "SKU-010", "Furniture", "Office", 349.99, 45),
+    ("Desk Lamp LED", "SKU-011", "Furniture", "Lighting", 39.99, 150),
+    ("Monitor Arm", "SKU-012", "Furniture", "Accessories", 89.99, 80),
+    ("Smart Watch", "SKU-013", "Electronics", "Wearables", 299.99, 100),
+    ("Fitness Tracker", "SKU-014", "Electronics", "Wearables", 79.99, 150),
+    ("Tablet 10inch", "SKU-015", "Electronics", "Tablets", 449.99, 70),
+    ("Bluetooth Speaker", "SKU-016", "Electronics", "Audio", 99.99, 120),
+    ("Power Bank 20000mAh", "SKU-017", "Electronics", "Accessories", 39.99, 200),
+    ("Wireless Charger", "SKU-018", "Electronics", "Accessories", 29.99, 180),
+    ("Gaming Mouse Pad", "SKU-019", "Electronics", "Accessories", 24.99, 250),
+    ("Cable Management Box", "SKU-020", "Furniture", "Organization", 19.99, 300)
+]
+
+# SQL statements are built once at import and reused for every batch.
+# One statement for the whole product list; MERGE on SKU skips products
+# that already exist instead of failing on the unique key
+PRODUCT_MERGE = """
+MERGE INTO ca.Products AS t
+USING (VALUES %s)
+    AS s (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity)
+ON t.SKU = s.SKU
+WHEN NOT MATCHED THEN
+    INSERT (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity, IsActive)
+    VALUES (s.ProductName, s.SKU, s.Category, s.SubCategory, s.UnitPrice, s.StockQuantity, 1);
+""" % ", ".join(["(?, ?, ?, ?, ?, ?)"] * len(SAMPLE_PRODUCTS))
+
+# IsActive is left to its column default, so the statement is all
+# placeholders and execute_many can widen it into multi-row VALUES
+CUSTOMER_INSERT = """
+INSERT INTO ca.Customers
+(FirstName, LastName, Email, Phone, DateOfBirth, Country, City)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Sent once per SQL_CHUNK_ROWS orders: MERGE (unlike INSERT) can OUTPUT
+# the source OrderKey next to the new OrderID, the items are inserted by
+# joining on that map, and the order totals are summed from the stored
+# line totals in one UPDATE
+ORDER_BATCH = """
+SET NOCOUNT ON;
+DECLARE @KeyMap TABLE (OrderKey INT PRIMARY KEY, OrderID INT);
+
+MERGE INTO ca.Orders
+USING (
+    SELECT OrderKey, CustomerID, OrderDate, OrderStatus
+    FROM OPENJSON(?) WITH (
+        OrderKey INT '$[0]',
+        CustomerID INT '$[1]',
+        OrderDate DATETIME2 '$[2]',
+        OrderStatus NVARCHAR(50) '$[3]'
+    )
+) AS s
+ON 1 = 0
+WHEN NOT MATCHED THEN
+    INSERT (CustomerID, OrderDate, TotalAmount, OrderStatus)
+    VALUES (s.CustomerID, s.OrderDate, 0, s.OrderStatus)
+OUTPUT s.OrderKey, INSERTED.OrderID INTO @KeyMap (OrderKey, OrderID);
+
+INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice)
+SELECT k.OrderID, i.ProductID, i.Quantity, i.UnitPrice
+FROM OPENJSON(?) WITH (
+    OrderKey INT '$[0]',
+    ProductID INT '$[1]',
+    Quantity INT '$[2]',
+    UnitPrice DECIMAL(18,2) '$[3]'
+) AS i
+JOIN @KeyMap k ON k.OrderKey = i.OrderKey;
+
+UPDATE o SET TotalAmount = t.Total
+FROM ca.Orders o
+JOIN (
+    SELECT oi.OrderID, SUM(oi.LineTotal) AS Total
+    FROM ca.OrderItems oi
+    JOIN @KeyMap k ON k.OrderID = oi.OrderID
+    GROUP BY oi.OrderID
+) t ON t.OrderID = o.OrderID;
+"""
+
 fake = Faker()
 
 
+def _is_duplicate(error):
+    """True if an insert failed on a unique key, i.e. the row already exists."""
+    message = str(error).lower()
+    return "duplicate key" in message or "violation" in message
+
+
+def embed_all(texts, embedding_service):
+    """
+    Embed texts with one generate_embeddings call, which batches them and
+    backs off on rate limits.
+    
+    Returns one vector per text, in input order, or None for every text if
+    the call failed.
+    """
+    if not texts:
+        return []
+    try:
+        embeddings = generate_embeddings(texts, embedding_service, use_azure=True)
+    except Exception as e:
+        print(f"  ⚠️  Embedding failed: {e}")
+        embeddings = []
+    return embeddings if len(embeddings) == len(texts) else [None] * len(texts)
+
+
+def existing_ids(cosmos_conn, container, ids):
+    """Return the subset of ids already present in a Cosmos container, in one query."""
+    try:
+        return set(cosmos_conn.query_items(
+            "SELECT VALUE c.id FROM c WHERE ARRAY_CONTAINS(@ids, c.id)",
+            parameters=[{"name": "@ids", "value": list(ids)}],
+            container=container
+        ))
+    except Exception as e:
+        print(f"  ⚠️  Could not check for existing items, loading all: {e}")
+        return set()
+
+
+def bulk_insert(sql_conn, query, rows):
+    """
+    Insert rows in one executemany transaction.
+    
+    If the batch fails (typically because some rows already exist from an
+    earlier run), the rows are retried one at a time so existing ones are
+    skipped as before. Other row errors are counted by type and reported in
+    one line rather than one line per row.
+    
+    Args:
+        sql_conn: FabricSQLConnector
+        query: Single-row parameterized INSERT
+        rows: Parameter tuples
+        
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    try:
+        return sql_conn.execute_many(query, rows)
+    except Exception as e:
+        if not _is_duplicate(e):
+            print(f"  ⚠️  Batch insert failed, retrying row by row: {e}")
+    
+    inserted = 0
+    errors = Counter()
+    for row in rows:
+        try:
+            sql_conn.execute_non_query(query, row)
+            inserted += 1
+        except Exception as e:
+            if not _is_duplicate(e):
+                errors[type(e).__name__] += 1
+    if errors:
+        print(f"  ✗ Errors inserting rows: {dict(errors)}")
+    return inserted
+
+
 # ============================================================================
 # FABRIC SQL DATABASE - Data Generation
 # ============================================================================
 
 def setup_sql_products(sql_conn):
     """Generate sample products in SQL Database."""
-    print("\n" + "="*60)
+    print("\n" + _BAR60)
     print("Setting up SQL Products")
-    print("="*60)
+    print(_BAR60)
     
-    products = [
-        ("Laptop Pro 15", "SKU-001", "Electronics", "Computers", 1299.99, 50),
-        ("Wireless Mouse", "SKU-002", "Electronics", "Accessories", 29.99, 150),
-        ("USB-C Hub", "SKU-003", "Electronics", "Accessories", 49.99, 200),
-        ("4K Monitor", "SKU-004", "Electronics", "Displays", 399.99, 75),
-        ("Mechanical Keyboard", "SKU-005", "Electronics", "Accessories", 129.99, 100),
-        ("Noise-Canceling Headphones", "SKU-006", "Electronics", "Audio", 249.99, 60),
-        ("Portable SSD 1TB", "SKU-007", "Electronics", "Storage", 119.99, 120),
-        ("Webcam HD", "SKU-008", "Electronics", "Accessories", 79.99, 90),
-        ("Standing Desk", "SKU-009", "Furniture", "Office", 499.99, 30),
-        ("Ergonomic Chair", "SKU-010", "Furniture", "Office", 349.99, 45),
-        ("Desk Lamp LED", "SKU-011", "Furniture", "Lighting", 39.99, 150),
-        ("Monitor Arm", "SKU-012", "Furniture", "Accessories", 89.99, 80),
-        ("Smart Watch", "SKU-013", "Electronics", "Wearables", 299.99, 100),
-        ("Fitness Tracker", "SKU-014", "Electronics", "Wearables", 79.99, 150),
-        ("Tablet 10inch", "SKU-015", "Electronics", "Tablets", 449.99, 70),
-        ("Bluetooth Speaker", "SKU-016", "Electronics", "Audio", 99.99, 120),
-        ("Power Bank 20000mAh", "SKU-017", "Electronics", "Accessories", 39.99, 200),
-        ("Wireless Charger", "SKU-018", "Electronics", "Accessories", 29.99, 180),
-        ("Gaming Mouse Pad", "SKU-019", "Electronics", "Accessories", 24.99, 250),
-        ("Cable Management Box", "SKU-020", "Furniture", "Organization", 19.99, 300)
-    ]
-    
-    inserted = 0
-    for product in products:
-        try:
-            query = """
-                INSERT INTO ca.Products 
-                (ProductName, SKU, Category, SubCategory, UnitPrice, StockQuantity, IsActive)
-                VALUES (?, ?, ?, ?, ?, ?, 1)
-            """
-            sql_conn.execute_non_query(query, product)
-            inserted += 1
-            print(f"  ✓ Inserted: {product[0]}")
-        except Exception as e:
-            if "duplicate key" in str(e).lower() or "violation" in str(e).lower():
-                print(f"  ⏭️  Skipped (exists): {product[0]}")
-            else:
-                print(f"  ✗ Error inserting {product[0]}: {e}")
+    try:
+        inserted = sql_conn.execute_non_query(
+            PRODUCT_MERGE, tuple(value for product in SAMPLE_PRODUCTS for value in product)
+        )
+        if inserted < len(SAMPLE_PRODUCTS):
+            print(f"  ⏭️  Skipped {len(SAMPLE_PRODUCTS) - inserted} products (exist)")
+    except Exception as e:
+        print(f"  ✗ Error inserting products: {e}")
+        inserted = 0
     
     print(f"\n✓ SQL Products setup complete: {inserted} products inserted\n")
     return inserted
@@ -83,39 +229,39 @@ def setup_sql_products(sql_conn):
 
 def setup_sql_customers(sql_conn, num_customers=100):
     """Generate sample customers in SQL Database."""
-    print("\n" + "="*60)
+    print("\n" + _BAR60)
     print(f"Setting up SQL Customers ({num_customers} records)")
-    print("="*60)
+    print(_BAR60)
     
-    segments = ['Bronze', 'Silver', 'Gold', 'Premium']
-    inserted = 0
+    # Names and places come from small Faker pools, drawn a column at a time
+    pool_size = min(num_customers, FAKER_POOL_SIZE)
+    first_name_pool = [fake.first_name() for _ in range(pool_size)]
+    last_name_pool = [fake.last_name() for _ in range(pool_size)]
+    country_pool = [fake.country()[:100] for _ in range(pool_size)]
+    city_pool = [fake.city()[:100] for _ in range(pool_size)]
     
-    for i in range(num_customers):
-        try:
-            query = """
-                INSERT INTO ca.Customers 
-                (FirstName, LastName, Email, Phone, DateOfBirth, Country, City, CustomerSegment, IsActive)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
-            """
-            customer_data = (
-                fake.first_name(),
-                fake.last_name(),
-                fake.email(),
-                fake.phone_number()[:20],
-                fake.date_of_birth(minimum_age=18, maximum_age=80),
-                fake.country()[:100],
-                fake.city()[:100],
-                random.choice(segments)
-            )
-            sql_conn.execute_non_query(query, customer_data)
-            inserted += 1
-            if (i + 1) % 20 == 0:
-                print(f"  ✓ Inserted {i + 1} customers...")
-        except Exception as e:
-            if "duplicate key" in str(e).lower() or "violation" in str(e).lower():
-                continue
-            else:
-                print(f"  ✗ Error inserting customer {i+1}: {e}")
+    def customer_chunks():
+        # Rows are generated and inserted SQL_CHUNK_ROWS at a time, so memory
+        # stays bounded however many customers are requested
+        for start in range(0, num_customers, SQL_CHUNK_ROWS):
+            k = min(SQL_CHUNK_ROWS, num_customers - start)
+            yield list(zip(
+                random.choices(first_name_pool, k=k),
+                random.choices(last_name_pool, k=k),
+                # Unique emails, so a batch never trips the Email constraint
+                [fake.unique.email() for _ in range(k)],
+                [fake.phone_number()[:20] for _ in range(k)],
+                [fake.date_of_birth(minimum_age=18, maximum_age=80) for _ in range(k)],
+                random.choices(country_pool, k=k),
+                random.choices(city_pool, k=k)
+            ))
+    
+    inserted = 0
+    for chunk in customer_chunks():
+        inserted += bulk_insert(sql_conn, CUSTOMER_INSERT, chunk)
+        # One progress line per chunk, only when there is more than one
+        if num_customers > SQL_CHUNK_ROWS:
+            print(f"  ✓ Inserted {inserted} customers...")
     
     print(f"\n✓ SQL Customers setup complete: {inserted} customers inserted\n")
     return inserted
@@ -123,72 +269,67 @@ def setup_sql_customers(sql_conn, num_customers=100):
 
 def setup_sql_orders(sql_conn, num_orders=200):
     """Generate sample orders in SQL Database."""
-    print("\n" + "="*60)
+    print("\n" + _BAR60)
     print(f"Setting up SQL Orders ({num_orders} records)")
-    print("="*60)
+    print(_BAR60)
     
-    # Get customer IDs
-    customers_df = sql_conn.execute_query("SELECT TOP 100 CustomerID FROM ca.Customers WHERE IsActive = 1")
-    if customers_df.empty:
+    # Plain cursor lookups: no DataFrame to build, and no cached result
+    # from before the customers and products were inserted
+    customer_ids = sql_conn.fetch_scalars("SELECT TOP 100 CustomerID FROM ca.Customers WHERE IsActive = 1")
+    if not customer_ids:
         print("  ⚠️  No customers found. Please run setup_sql_customers first.")
         return 0
     
-    # Convert to native Python int to avoid numpy.int64 issues
-    customer_ids = [int(cid) for cid in customers_df['CustomerID'].tolist()]
-    
     # Get product IDs and prices
-    products_df = sql_conn.execute_query("SELECT ProductID, UnitPrice FROM ca.Products WHERE IsActive = 1")
-    if products_df.empty:
+    product_rows = [
+        (int(product_id), float(unit_price))
+        for product_id, unit_price in sql_conn.fetch_rows("SELECT ProductID, UnitPrice FROM ca.Products WHERE IsActive = 1")
+    ]
+    if not product_rows:
         print("  ⚠️  No products found. Please run setup_sql_products first.")
         return 0
     
+    # Generate every order and its items first; items point at their order
+    # by its position in the list (OrderKey) until the OrderIDs exist
+    # 1-5 products per order; every item's product is drawn in one call
+    # and handed out in order
+    item_counts = [random.randint(1, 5) for _ in range(num_orders)]
+    item_products = iter(random.choices(product_rows, k=sum(item_counts)))
+    orders = []
+    order_items = []
+    for order_key, item_count in enumerate(item_counts):
+        customer_id = random.choice(customer_ids)
+        order_date = fake.date_time_between(start_date='-2y', end_date='now')
+        order_status = random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled'])
+        
+        for product_id, unit_price in islice(item_products, item_count):
+            order_items.append((order_key, product_id, random.randint(1, 3), unit_price))
+        
+        orders.append((order_key, customer_id, order_date.isoformat(), order_status))
+    
+    # Items were generated in order, so each chunk's items are one slice
+    item_offsets = list(accumulate(item_counts, initial=0))
     inserted = 0
-    for i in range(num_orders):
+    items_inserted = 0
+    for start in range(0, num_orders, SQL_CHUNK_ROWS):
+        end = min(start + SQL_CHUNK_ROWS, num_orders)
+        chunk_items = order_items[item_offsets[start]:item_offsets[end]]
         try:
-            customer_id = int(random.choice(customer_ids))  # Ensure int
-            order_date = fake.date_time_between(start_date='-2y', end_date='now')
-            
-            # Insert order
-            order_query = """
-                INSERT INTO ca.Orders (CustomerID, OrderDate, TotalAmount, OrderStatus)
-                OUTPUT INSERTED.OrderID
-                VALUES (?, ?, ?, ?)
-            """
-            order_status = random.choice(['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled'])
-            result = sql_conn.execute_query(order_query, (customer_id, order_date, 0.0, order_status))
-            
-            if not result.empty:
-                # Convert order_id to native Python int
-                order_id = int(result.iloc[0]['OrderID'])
-                
-                # Insert order details (1-5 products per order)
-                num_items = random.randint(1, 5)
-                total_amount = 0.0
-                
-                for _ in range(num_items):
-                    product = products_df.sample(1).iloc[0]
-                    quantity = int(random.randint(1, 3))  # Ensure int
-                    # Convert product_id to native Python int
-                    product_id = int(product['ProductID'])
-                    unit_price = float(product['UnitPrice'])
-                    line_total = float(quantity * unit_price)  # Ensure float
-                    total_amount += line_total
-                    
-                    detail_query = """
-                        INSERT INTO ca.OrderItems (OrderID, ProductID, Quantity, UnitPrice, LineTotal)
-                        VALUES (?, ?, ?, ?, ?)
-                    """
-                    sql_conn.execute_non_query(detail_query, (order_id, product_id, quantity, unit_price, line_total))
-                
-                # Update order total - ensure float
-                update_query = "UPDATE ca.Orders SET TotalAmount = ? WHERE OrderID = ?"
-                sql_conn.execute_non_query(update_query, (float(total_amount), order_id))
-                
-                inserted += 1
-                if (i + 1) % 50 == 0:
-                    print(f"  ✓ Inserted {i + 1} orders...")
+            sql_conn.execute_non_query(ORDER_BATCH, (json.dumps(orders[start:end]), json.dumps(chunk_items)))
+            inserted += end - start
+            items_inserted += len(chunk_items)
+        except Exception as e:
+            print(f"  ✗ Error inserting orders {start + 1}-{end}: {e}")
+    print(f"  ✓ Inserted {inserted} orders with {items_inserted} order items")
+    
+    # CustomerSegment is computed from TotalLifetimeValue, so recompute it
+    # for the ordering customers in one call
+    if inserted:
+        try:
+            sql_conn.update_customer_lifetime_values(customer_ids)
+            print(f"  ✓ Updated lifetime values for {len(customer_ids)} customers")
         except Exception as e:
-            print(f"  ✗ Error inserting order {i+1}: {e}")
+            print(f"  ✗ Error updating customer lifetime values: {e}")
     
     print(f"\n✓ SQL Orders setup complete: {inserted} orders inserted\n")
     return inserted
@@ -200,9 +341,9 @@ def setup_sql_orders(sql_conn, num_orders=200):
 
 def setup_cosmos_products(cosmos_conn, embedding_service):
     """Generate products with embeddings in CosmosDB."""
-    print("\n" + "="*60)
+    print("\n" + _BAR60)
     print("Setting up CosmosDB Products with Embeddings")
-    print("="*60)
+    print(_BAR60)
     
     products = [
         {
@@ -267,28 +408,34 @@ def setup_cosmos_products(cosmos_conn, embedding_service):
         }
     ]
     
-    inserted = 0
+    # Products loaded by an earlier run are skipped before paying for their embeddings
+    existing = existing_ids(cosmos_conn, cosmos_conn.products_container, [product['id'] for product in products])
     for product in products:
-        try:
-            # Generate embedding for product
-            text = f"{product['name']} {product['description']}"
-            embeddings = generate_embeddings([text], embedding_service, use_azure=True)
-            
-            if embeddings and len(embeddings) > 0:
-                product['embedding'] = embeddings[0]
-                product['type'] = 'product'
-                product['createdAt'] = datetime.utcnow().isoformat()
-                
-                cosmos_conn.products_container.upsert_item(body=product)
-                inserted += 1
-                print(f"  ✓ Inserted: {product['name']}")
-            else:
-                print(f"  ⚠️  Skipped {product['name']}: Could not generate embedding")
-        except Exception as e:
-            if "Conflict" in str(e) or "409" in str(e):
-                print(f"  ⏭️  Skipped (exists): {product['name']}")
-            else:
-                print(f"  ✗ Error inserting {product['name']}: {e}")
+        if product['id'] in existing:
+            print(f"  ⏭️  Skipped (exists): {product['name']}")
+    products = [product for product in products if product['id'] not in existing]
+    
+    # Embed every product description up front, a batch per call
+    embeddings = embed_all([f"{product['name']} {product['description']}" for product in products], embedding_service)
+    
+    # Every product shares one timestamp
+    created_at = datetime.utcnow().isoformat()
+    documents = []
+    for product, embedding in zip(products, embeddings):
+        if embedding is None:
+            print(f"  ⚠️  Skipped {product['name']}: Could not generate embedding")
+            continue
+        product['embedding'] = embedding
+        product['type'] = 'product'
+        product['createdAt'] = created_at
+        documents.append(product)
+    
+    # Upserts are batched per category partition and sent concurrently
+    try:
+        inserted = cosmos_conn.upsert_items_bulk(cosmos_conn.products_container, documents, 'category', 'product')
+    except Exception as e:
+        print(f"  ✗ Error upserting products: {e}")
+        inserted = 0
     
     print(f"\n✓ CosmosDB Products setup complete: {inserted} products inserted\n")
     return inserted
@@ -296,9 +443,9 @@ def setup_cosmos_products(cosmos_conn, embedding_service):
 
 def setup_cosmos_reviews(cosmos_conn, embedding_service):
     """Generate reviews with embeddings for SQL products in CosmosDB."""
-    print("\n" + "="*60)
+    print("\n" + _BAR60)
     print("Setting up CosmosDB Reviews with Embeddings")
-    print("="*60)
+    print(_BAR60)
     
     # Review templates
     positive_templates = [
@@ -343,56 +490,64 @@ def setup_cosmos_reviews(cosmos_conn, embedding_service):
         {"id": "PROD-004", "name": "4K Monitor", "type": "monitor"},
     ]
     
-    inserted = 0
+    # Draw every review first so all texts can be embedded in batches;
+    # review dates are offsets from one shared timestamp
+    now = datetime.utcnow()
+    reviews = []
     for product in products:
         for review_num in range(1, 6):  # 5 reviews per product
-            try:
-                # Determine sentiment
-                rand = random.random()
-                if rand < 0.6:  # 60% positive
-                    sentiment = "positive"
-                    rating = random.randint(4, 5)
-                    template = random.choice(positive_templates)
-                elif rand < 0.85:  # 25% neutral
-                    sentiment = "neutral"
-                    rating = 3
-                    template = random.choice(neutral_templates)
-                else:  # 15% negative
-                    sentiment = "negative"
-                    rating = random.randint(1, 2)
-                    template = random.choice(negative_templates)
-                
-                # Get product-specific detail
-                detail = random.choice(product_details.get(product['type'], product_details['default']))
-                review_text = template.format(product=product['name'], detail=detail)
-                
-                # Generate embedding
-                embeddings = generate_embeddings([review_text], embedding_service, use_azure=True)
-                
-                if embeddings and len(embeddings) > 0:
-                    review_data = {
-                        "id": f"review-{product['id']}-{review_num:03d}",
-                        "productId": product['id'],
-                        "reviewText": review_text,
-                        "rating": rating,
-                        "sentimentLabel": sentiment,
-                        "sentimentScore": random.uniform(0.7, 0.99) if sentiment == "positive" else random.uniform(0.01, 0.3),
-                        "reviewDate": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat(),
-                        "type": "review",
-                        "embedding": embeddings[0]
-                    }
-                    
-                    cosmos_conn.reviews_container.upsert_item(body=review_data)
-                    inserted += 1
-                    if inserted % 10 == 0:
-                        print(f"  ✓ Inserted {inserted} reviews...")
-                else:
-                    print(f"  ⚠️  Skipped review for {product['name']}: Could not generate embedding")
-            except Exception as e:
-                if "Conflict" in str(e) or "409" in str(e):
-                    continue
-                else:
-                    print(f"  ✗ Error inserting review: {e}")
+            # Determine sentiment
+            rand = random.random()
+            if rand < 0.6:  # 60% positive
+                sentiment = "positive"
+                rating = random.randint(4, 5)
+                template = random.choice(positive_templates)
+            elif rand < 0.85:  # 25% neutral
+                sentiment = "neutral"
+                rating = 3
+                template = random.choice(neutral_templates)
+            else:  # 15% negative
+                sentiment = "negative"
+                rating = random.randint(1, 2)
+                template = random.choice(negative_templates)
+            
+            # Get product-specific detail
+            detail = random.choice(product_details.get(product['type'], product_details['default']))
+            review_text = template.format(product=product['name'], detail=detail)
+            
+            reviews.append((product, {
+                "id": f"review-{product['id']}-{review_num:03d}",
+                "productId": product['id'],
+                "reviewText": review_text,
+                "rating": rating,
+                "sentimentLabel": sentiment,
+                "sentimentScore": random.uniform(0.7, 0.99) if sentiment == "positive" else random.uniform(0.01, 0.3),
+                "reviewDate": (now - timedelta(days=random.randint(1, 365))).isoformat(),
+                "type": "review"
+            }))
+    
+    # Reviews loaded by an earlier run are skipped before paying for their embeddings
+    existing = existing_ids(cosmos_conn, cosmos_conn.reviews_container, [review_data['id'] for _, review_data in reviews])
+    reviews = [(product, review_data) for product, review_data in reviews if review_data['id'] not in existing]
+    if existing:
+        print(f"  ⏭️  Skipped {len(existing)} existing reviews")
+    
+    embeddings = embed_all([review_data['reviewText'] for _, review_data in reviews], embedding_service)
+    
+    documents = []
+    for (_, review_data), embedding in zip(reviews, embeddings):
+        if embedding is not None:
+            review_data['embedding'] = embedding
+            documents.append(review_data)
+    if len(documents) < len(reviews):
+        print(f"  ⚠️  Skipped {len(reviews) - len(documents)} reviews: Could not generate embeddings")
+    
+    # Upserts are batched per product partition and sent concurrently
+    try:
+        inserted = cosmos_conn.upsert_items_bulk(cosmos_conn.reviews_container, documents, 'productId', 'review')
+    except Exception as e:
+        print(f"  ✗ Error upserting reviews: {e}")
+        inserted = 0
     
     print(f"\n✓ CosmosDB Reviews setup complete: {inserted} reviews inserted\n")
     return inserted
@@ -404,14 +559,14 @@ def setup_cosmos_reviews(cosmos_conn, embedding_service):
 
 def main():
     """Main setup function."""
-    print("\n" + "="*70)
+    print("\n" + _BAR70)
     print(" IntelliCA Microsoft Fabric Environment Setup")
-    print("="*70)
+    print(_BAR70)
     print("\nThis script will initialize all required data for your environment.")
     print("\nComponents:")
     print("  • Fabric SQL Database: Customers, Products, Orders")
     print("  • Fabric CosmosDB: Products & Reviews (with embeddings)")
-    print("\n" + "="*70 + "\n")
+    print("\n" + _BAR70 + "\n")
     
     try:
         # Initialize SQL connector
@@ -441,8 +596,13 @@ def main():
         print("✓ Embedding service initialized\n")
         
         # Setup SQL Database
-        sql_products = setup_sql_products(sql_conn)
-        sql_customers = setup_sql_customers(sql_conn, num_customers=100)
+        # Products and customers are independent tables; load them side by
+        # side on the connector's connection pool. Orders need both.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            products_future = executor.submit(setup_sql_products, sql_conn)
+            customers_future = executor.submit(setup_sql_customers, sql_conn, num_customers=100)
+            sql_products = products_future.result()
+            sql_customers = customers_future.result()
         sql_orders = setup_sql_orders(sql_conn, num_orders=200)
         
         # Setup CosmosDB
@@ -450,9 +610,9 @@ def main():
         cosmos_reviews = setup_cosmos_reviews(cosmos_conn, embedding_service)
         
         # Summary
-        print("\n" + "="*70)
+        print("\n" + _BAR70)
         print(" Setup Complete!")
-        print("="*70)
+        print(_BAR70)
         print(f"\nFabric SQL Database:")
         print(f"  • Products: {sql_products} records")
         print(f"  • Customers: {sql_customers} records")
@@ -461,7 +621,7 @@ def main():
         print(f"  • Products: {cosmos_products} records")
         print(f"  • Reviews: {cosmos_reviews} records")
         print("\n✓ Your IntelliCA environment is ready to use!")
-        print("="*70 + "\n")
+        print(_BAR70 + "\n")
         
     except Exception as e:
         print(f"\n❌ Setup failed: {e}")
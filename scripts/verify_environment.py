@@ -9,6 +9,7 @@ Run this script to verify your environment is properly set up.
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -18,13 +19,34 @@ load_dotenv()
 from src.database.fabric_sql import FabricSQLConnector
 from src.database.fabric_cosmos import FabricCosmosDBConnector
 
+_BAR70 = "=" * 70
+
+
+def check_sql_table(sql_conn, table, sample_cols):
+    """Count and sample one SQL table; returns (count, report lines)."""
+    lines = [f"\n{table}:"]
+    try:
+        # Count and sample in one round trip; OUTER APPLY keeps the
+        # count row even when the table is empty
+        query = f"""
+            SELECT c.RecordCount, s.*
+            FROM (SELECT COUNT_BIG(*) AS RecordCount FROM {table}) c
+            OUTER APPLY (SELECT TOP 1 {sample_cols} FROM {table}) s
+        """
+        df = sql_conn.execute_query(query)
+        count = int(df.iloc[0]['RecordCount']) if not df.empty else 0
+        
+        lines.append(f"  Records: {count}")
+        if count > 0:
+            lines.append(f"  Sample: {df.drop(columns='RecordCount').iloc[0].to_dict()}")
+        return count, lines
+    except Exception as e:
+        lines.append(f"  ✗ Error: {e}")
+        return 0, lines
+
 
 def check_sql_data(sql_conn):
-    """Check data in Fabric SQL Database."""
-    print("\n" + "="*70)
-    print(" Fabric SQL Database Status")
-    print("="*70)
-    
+    """Check data in Fabric SQL Database; returns (total records, report lines)."""
     tables = [
         ("ca.Customers", "CustomerID", "FirstName, LastName, Email"),
         ("ca.Products", "ProductID", "ProductName, Category, UnitPrice"),
@@ -32,98 +54,103 @@ def check_sql_data(sql_conn):
         ("ca.OrderItems", "OrderItemID", "OrderID, ProductID, Quantity")
     ]
     
+    lines = ["\n" + _BAR70, " Fabric SQL Database Status", _BAR70]
     total_records = 0
-    for table, id_col, sample_cols in tables:
-        try:
-            # Count records
-            count_query = f"SELECT COUNT(*) as count FROM {table}"
-            count_df = sql_conn.execute_query(count_query)
-            count = count_df.iloc[0]['count'] if not count_df.empty else 0
+    # Tables are checked concurrently, each on its own pooled connection;
+    # map keeps the report in table order
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        results = executor.map(
+            lambda spec: check_sql_table(sql_conn, spec[0], spec[2]),
+            tables
+        )
+        for count, table_lines in results:
             total_records += count
-            
-            # Get sample record
-            sample_query = f"SELECT TOP 1 {sample_cols} FROM {table}"
-            sample_df = sql_conn.execute_query(sample_query)
-            
-            print(f"\n{table}:")
-            print(f"  Records: {count}")
-            if not sample_df.empty and count > 0:
-                print(f"  Sample: {sample_df.iloc[0].to_dict()}")
-            
-        except Exception as e:
-            print(f"\n{table}:")
-            print(f"  ✗ Error: {e}")
+            lines.extend(table_lines)
     
-    print(f"\nTotal SQL Records: {total_records}")
-    return total_records
+    lines.append(f"\nTotal SQL Records: {total_records}")
+    return total_records, lines
 
 
-def check_cosmos_data(cosmos_conn):
-    """Check data in Fabric CosmosDB."""
-    print("\n" + "="*70)
-    print(" Fabric CosmosDB NoSQL Status")
-    print("="*70)
-    
-    total_records = 0
-    
-    # Check Products
+def check_cosmos_products(cosmos_conn):
+    """Count and sample the products container; returns (count, report lines)."""
+    lines = ["\nProducts Container:"]
     try:
         products = cosmos_conn.get_all_products(limit=1000)
-        print(f"\nProducts Container:")
-        print(f"  Records: {len(products)}")
+        lines.append(f"  Records: {len(products)}")
         if products:
             sample = products[0]
-            print(f"  Sample: {sample.get('name', 'N/A')} - {sample.get('category', 'N/A')}")
-            print(f"  Has embeddings: {'embedding' in sample}")
-        total_records += len(products)
+            lines.append(f"  Sample: {sample.get('name', 'N/A')} - {sample.get('category', 'N/A')}")
+            lines.append(f"  Has embeddings: {'embedding' in sample}")
+        return len(products), lines
     except Exception as e:
-        print(f"\nProducts Container:")
-        print(f"  ✗ Error: {e}")
-    
-    # Check Reviews
+        lines.append(f"  ✗ Error: {e}")
+        return 0, lines
+
+
+def count_and_sample(container, doc_type):
+    """Count documents of one type server-side and fetch a single sample."""
+    count = next(iter(container.query_items(
+        query="SELECT VALUE COUNT(1) FROM c WHERE c.type = @type",
+        parameters=[{"name": "@type", "value": doc_type}],
+        enable_cross_partition_query=True
+    )), 0)
+    sample = next(iter(container.query_items(
+        query="SELECT TOP 1 * FROM c WHERE c.type = @type",
+        parameters=[{"name": "@type", "value": doc_type}],
+        enable_cross_partition_query=True
+    )), None) if count else None
+    return count, sample
+
+
+def check_cosmos_reviews(cosmos_conn):
+    """Count and sample the reviews container; returns (count, report lines)."""
+    lines = ["\nReviews Container:"]
     try:
-        query = "SELECT * FROM c WHERE c.type = 'review'"
-        reviews = list(cosmos_conn.reviews_container.query_items(
-            query=query,
-            enable_cross_partition_query=True
-        ))
-        print(f"\nReviews Container:")
-        print(f"  Records: {len(reviews)}")
-        if reviews:
-            sample = reviews[0]
-            print(f"  Sample: Product {sample.get('productId', 'N/A')} - Rating: {sample.get('rating', 'N/A')}")
-            print(f"  Has embeddings: {'embedding' in sample}")
-        total_records += len(reviews)
+        count, sample = count_and_sample(cosmos_conn.reviews_container, 'review')
+        lines.append(f"  Records: {count}")
+        if sample:
+            lines.append(f"  Sample: Product {sample.get('productId', 'N/A')} - Rating: {sample.get('rating', 'N/A')}")
+            lines.append(f"  Has embeddings: {'embedding' in sample}")
+        return count, lines
     except Exception as e:
-        print(f"\nReviews Container:")
-        print(f"  ✗ Error: {e}")
-    
-    # Check Sessions
+        lines.append(f"  ✗ Error: {e}")
+        return 0, lines
+
+
+def check_cosmos_sessions(cosmos_conn):
+    """Count and sample the sessions container; returns (count, report lines)."""
+    lines = ["\nSessions Container:"]
     try:
-        query = "SELECT * FROM c WHERE c.type = 'session'"
-        sessions = list(cosmos_conn.container.query_items(
-            query=query,
-            enable_cross_partition_query=True,
-            max_item_count=10
-        ))
-        print(f"\nSessions Container:")
-        print(f"  Records: {len(sessions)} (showing first 10)")
-        if sessions:
-            print(f"  Sample: Session {sessions[0].get('id', 'N/A')}")
-        total_records += len(sessions)
+        count, sample = count_and_sample(cosmos_conn.container, 'session')
+        lines.append(f"  Records: {count}")
+        if sample:
+            lines.append(f"  Sample: Session {sample.get('id', 'N/A')}")
+        return count, lines
     except Exception as e:
-        print(f"\nSessions Container:")
-        print(f"  ✗ Error: {e}")
+        lines.append(f"  ✗ Error: {e}")
+        return 0, lines
+
+
+def check_cosmos_data(cosmos_conn):
+    """Check data in Fabric CosmosDB; returns (total records, report lines)."""
+    checks = [check_cosmos_products, check_cosmos_reviews, check_cosmos_sessions]
+    
+    lines = ["\n" + _BAR70, " Fabric CosmosDB NoSQL Status", _BAR70]
+    total_records = 0
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        for count, container_lines in executor.map(lambda check: check(cosmos_conn), checks):
+            total_records += count
+            lines.extend(container_lines)
     
-    print(f"\nTotal CosmosDB Records: {total_records}")
-    return total_records
+    lines.append(f"\nTotal CosmosDB Records: {total_records}")
+    return total_records, lines
 
 
 def main():
     """Main verification function."""
-    print("\n" + "="*70)
+    print("\n" + _BAR70)
     print(" IntelliCA Environment Verification")
-    print("="*70)
+    print(_BAR70)
     
     try:
         # Connect to SQL
@@ -147,14 +174,18 @@ def main():
         cosmos_conn.initialize()
         print("✓ Connected to Fabric CosmosDB")
         
-        # Check data
-        sql_records = check_sql_data(sql_conn)
-        cosmos_records = check_cosmos_data(cosmos_conn)
+        # Check both stores at once, then print their reports in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sql_future = executor.submit(check_sql_data, sql_conn)
+            cosmos_future = executor.submit(check_cosmos_data, cosmos_conn)
+            sql_records, sql_lines = sql_future.result()
+            cosmos_records, cosmos_lines = cosmos_future.result()
+        print("\n".join(sql_lines + cosmos_lines))
         
         # Summary
-        print("\n" + "="*70)
+        print("\n" + _BAR70)
         print(" Verification Summary")
-        print("="*70)
+        print(_BAR70)
         print(f"\nFabric SQL Database: {sql_records} total records")
         print(f"Fabric CosmosDB: {cosmos_records} total records")
         
@@ -163,7 +194,7 @@ def main():
         else:
             print("\n⚠️  Some data is missing. Run setup_environment.py to initialize.")
         
-        print("="*70 + "\n")
+        print(_BAR70 + "\n")
         
     except Exception as e:
         print(f"\n❌ Verification failed: {e}")
@@ -13,10 +13,18 @@ CREATE TABLE ca.Customers (
     RegistrationDate DATETIME DEFAULT GETDATE(),
     Country NVARCHAR(100),
     City NVARCHAR(100),
-    CustomerSegment NVARCHAR(50), -- e.g., 'Premium', 'Standard', 'Basic'
     IsActive BIT DEFAULT 1,
     LastPurchaseDate DATETIME,
     TotalLifetimeValue DECIMAL(18,2) DEFAULT 0,
+    -- Derived from TotalLifetimeValue, so it stays current without a batch UPDATE
+    CustomerSegment AS (
+        CASE
+            WHEN TotalLifetimeValue >= 10000 THEN 'Premium'
+            WHEN TotalLifetimeValue >= 5000 THEN 'Gold'
+            WHEN TotalLifetimeValue >= 1000 THEN 'Silver'
+            ELSE 'Bronze'
+        END
+    ) PERSISTED,
     ChurnRiskScore DECIMAL(5,2) DEFAULT 0 -- 0-100 scale
 );
 
@@ -88,6 +96,7 @@ CREATE INDEX IX_Customers_Email ON ca.Customers(Email);
 CREATE INDEX IX_Customers_Segment ON ca.Customers(CustomerSegment);
 CREATE INDEX IX_Orders_CustomerID ON ca.Orders(CustomerID);
 CREATE INDEX IX_Orders_OrderDate ON ca.Orders(OrderDate);
+CREATE INDEX IX_Orders_Customer_Status_Incl ON ca.Orders(CustomerID, OrderStatus) INCLUDE (TotalAmount, OrderDate);
 CREATE INDEX IX_OrderItems_OrderID ON ca.OrderItems(OrderID);
 CREATE INDEX IX_OrderItems_ProductID ON ca.OrderItems(ProductID);
 CREATE INDEX IX_CustomerInteractions_CustomerID ON ca.CustomerInteractions(CustomerID);
@@ -163,6 +172,18 @@ ORDER BY o.OrderDate DESC;
 
 GO
 
+-- Table Record Counts View (used by scripts/database_summary.py)
+CREATE VIEW ca.vw_TableCounts AS
+SELECT 1 AS SortOrder, 'Products' AS TableName, COUNT_BIG(*) AS RecordCount FROM ca.Products
+UNION ALL
+SELECT 2, 'Customers', COUNT_BIG(*) FROM ca.Customers
+UNION ALL
+SELECT 3, 'Orders', COUNT_BIG(*) FROM ca.Orders
+UNION ALL
+SELECT 4, 'OrderItems', COUNT_BIG(*) FROM ca.OrderItems;
+
+GO
+
 -- Stored procedure for updating customer lifetime value
 CREATE PROCEDURE ca.sp_UpdateCustomerLifetimeValue
     @CustomerID INT
@@ -185,17 +206,26 @@ END;
 
 GO
 
--- Stored procedure for customer segmentation
-CREATE PROCEDURE ca.sp_UpdateCustomerSegmentation
+-- Table type for passing customer IDs to batch procedures
+CREATE TYPE ca.IntList AS TABLE (Id INT PRIMARY KEY);
+
+GO
+
+-- Stored procedure for updating lifetime value of many customers in one call
+CREATE PROCEDURE ca.sp_UpdateCustomerLifetimeValueBatch
+    @Ids ca.IntList READONLY
 AS
 BEGIN
-    UPDATE ca.Customers
-    SET CustomerSegment = 
-        CASE 
-            WHEN TotalLifetimeValue >= 10000 THEN 'Premium'
-            WHEN TotalLifetimeValue >= 5000 THEN 'Gold'
-            WHEN TotalLifetimeValue >= 1000 THEN 'Silver'
-            ELSE 'Bronze'
-        END
-    WHERE IsActive = 1;
+    UPDATE c
+    SET TotalLifetimeValue = x.LifetimeValue,
+        LastPurchaseDate = x.LastPurchaseDate
+    FROM ca.Customers c
+    JOIN @Ids i ON c.CustomerID = i.Id
+    OUTER APPLY (
+        SELECT
+            ISNULL(SUM(CASE WHEN o.OrderStatus NOT IN ('Cancelled') THEN o.TotalAmount END), 0) AS LifetimeValue,
+            MAX(o.OrderDate) AS LastPurchaseDate
+        FROM ca.Orders o
+        WHERE o.CustomerID = i.Id
+    ) x;
 END;
@@ -1,4 +1,7 @@
 """Agent Framework package initialization."""
-from .agent_config import create_agent, get_embedding_service, generate_embeddings
+from .agent_config import (
+    create_agent, get_embedding_service, close_embedding_service,
+    generate_embeddings
+)
 
-__all__ = ['create_agent', 'get_embedding_service', 'generate_embeddings']
+__all__ = ['create_agent', 'get_embedding_service', 'close_embedding_service', 'generate_embeddings']
@@ -1,16 +1,34 @@
 """Agent Framework configuration and initialization."""
 import os
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from typing import Optional, List
 import logging
 from azure.identity import DefaultAzureCredential, AzureCliCredential
 from agent_framework.azure import AzureOpenAIResponsesClient
 from agent_framework.openai import OpenAIResponsesClient
-from openai import AzureOpenAI, OpenAI
+from openai import AzureOpenAI, OpenAI, RateLimitError, APIConnectionError, InternalServerError
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Inputs per embeddings request (the API accepts up to 2048; some older
+# Azure deployments accept only 16) and an estimated token budget per request
+EMBEDDING_MAX_INPUTS = int(os.getenv("EMBEDDING_MAX_INPUTS", "2048"))
+EMBEDDING_MAX_TOKENS = int(os.getenv("EMBEDDING_MAX_TOKENS", "250000"))
+# Embeddings requests in flight at once, and retries of a throttled or
+# transiently failing request (the only retry layer: shared clients are
+# built with max_retries=0)
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = 4
+
+# Embeddings clients shared by get_embedding_service, keyed by
+# (use_azure, endpoint, api_version)
+_embedding_clients = {}
+_embedding_clients_lock = threading.Lock()
+
 
 def create_agent(use_azure: bool = True):
     """
@@ -100,6 +118,10 @@ def get_embedding_service(use_azure: bool = True):
     """
     Create an embedding service for vector generation using OpenAI SDK.
     
+    Clients are cached per (use_azure, endpoint, api_version) and shared, so
+    every caller (including generate_embeddings without an explicit client)
+    reuses its pooled HTTP connections instead of opening new ones.
+    
     Args:
         use_azure: If True, use Azure OpenAI; otherwise use OpenAI directly
         
@@ -116,27 +138,71 @@ def get_embedding_service(use_azure: bool = True):
                 "Azure OpenAI credentials not found. "
                 "Please set AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY"
             )
-        
-        # Create Azure OpenAI client for embeddings
-        client = AzureOpenAI(
-            api_key=api_key,
-            api_version=api_version,
-            azure_endpoint=endpoint
-        )
-        logger.info(f"Initialized Azure OpenAI embeddings client")
-        return client
-        
     else:
+        endpoint = api_version = None
         api_key = os.getenv("OPENAI_API_KEY")
         
         if not api_key:
             raise ValueError(
                 "OpenAI API key not found. Please set OPENAI_API_KEY"
             )
-        
-        client = OpenAI(api_key=api_key)
-        logger.info("Initialized OpenAI embeddings client")
-        return client
+    
+    key = (use_azure, endpoint, api_version)
+    with _embedding_clients_lock:
+        client = _embedding_clients.get(key)
+        if client is None:
+            if use_azure:
+                # Create Azure OpenAI client for embeddings
+                client = AzureOpenAI(
+                    api_key=api_key,
+                    api_version=api_version,
+                    azure_endpoint=endpoint,
+                    max_retries=0
+                )
+                logger.info("Initialized Azure OpenAI embeddings client")
+            else:
+                client = OpenAI(api_key=api_key, max_retries=0)
+                logger.info("Initialized OpenAI embeddings client")
+            _embedding_clients[key] = client
+    return client
+
+
+def close_embedding_service() -> None:
+    """Close every cached embeddings client and its HTTP connection pool."""
+    with _embedding_clients_lock:
+        clients = list(_embedding_clients.values())
+        _embedding_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Error closing embeddings client: {e}")
+
+
+def _retry_after_seconds(error: Exception, attempt: int) -> float:
+    """Seconds a throttled request asked to wait, or exponential backoff (1s, 2s, 4s, ...) without a hint."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+        try:
+            return float(headers.get(header)) * scale
+        except (TypeError, ValueError):
+            continue
+    return float(2 ** attempt)
+
+
+def _embedding_batches(texts: List[str]):
+    """Split texts into batches bounded by EMBEDDING_MAX_INPUTS and EMBEDDING_MAX_TOKENS."""
+    batch, batch_tokens = [], 0
+    for text in texts:
+        # Rough estimate of about 4 characters per token
+        tokens = len(text) // 4 + 1
+        if batch and (len(batch) == EMBEDDING_MAX_INPUTS or batch_tokens + tokens > EMBEDDING_MAX_TOKENS):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        yield batch
 
 
 def generate_embeddings(
@@ -164,15 +230,31 @@ def generate_embeddings(
     else:
         model = "text-embedding-ada-002"
     
-    # Generate embeddings using OpenAI SDK
-    embeddings = []
-    for text in texts:
-        response = embedding_service.embeddings.create(
-            input=text,
-            model=model
-        )
-        embedding = response.data[0].embedding
-        embeddings.append(embedding)
+    def embed_batch(batch):
+        for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+            try:
+                response = embedding_service.embeddings.create(
+                    input=batch,
+                    model=model
+                )
+                break
+            except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                # The transient errors the SDK would otherwise have retried
+                if attempt == EMBEDDING_MAX_RETRIES:
+                    raise
+                time.sleep(_retry_after_seconds(e, attempt))
+        # Results carry the index of their input; keep the input order
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+    
+    # One request per batch of texts instead of one per text, with up to
+    # EMBEDDING_CONCURRENCY batches in flight on the shared client
+    batches = list(_embedding_batches(texts))
+    if len(batches) <= 1:
+        results = [embed_batch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_CONCURRENCY, len(batches))) as executor:
+            results = list(executor.map(embed_batch, batches))
+    embeddings = [embedding for batch in results for embedding in batch]
     
     logger.info(f"Generated embeddings for {len(texts)} texts using {model}")
     return embeddings
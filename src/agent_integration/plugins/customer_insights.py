@@ -2,6 +2,7 @@
 from agent_framework import ai_function
 from typing import Annotated
 import logging
+from .serialization import to_json, records_json
 
 logger = logging.getLogger(__name__)
 
@@ -65,8 +66,7 @@ class CustomerInsightsPlugin:
                 "recentSessions": len(sessions_df) if not sessions_df.empty else 0
             }
             
-            import json
-            return json.dumps(result, indent=2)
+            return to_json(result)
             
         except Exception as e:
             logger.error(f"Error getting customer profile: {e}")
@@ -95,18 +95,7 @@ class CustomerInsightsPlugin:
             if customers_df.empty:
                 return "No customers found"
             
-            customers_list = customers_df.to_dict(orient='records')
-            
-            # Convert to serializable format
-            for customer in customers_list:
-                for key, value in customer.items():
-                    if hasattr(value, 'isoformat'):
-                        customer[key] = value.isoformat()
-                    elif not isinstance(value, (str, int, float, bool, type(None))):
-                        customer[key] = str(value)
-            
-            import json
-            return json.dumps(customers_list, indent=2)
+            return records_json(customers_df)
             
         except Exception as e:
             logger.error(f"Error getting top customers: {e}")
@@ -208,18 +197,7 @@ class CustomerInsightsPlugin:
             if customers_df.empty:
                 return f"No customers found with churn risk >= {threshold}"
             
-            customers_list = customers_df.to_dict(orient='records')
-            
-            # Convert to serializable format
-            for customer in customers_list:
-                for key, value in customer.items():
-                    if hasattr(value, 'isoformat'):
-                        customer[key] = value.isoformat()
-                    elif not isinstance(value, (str, int, float, bool, type(None))):
-                        customer[key] = str(value)
-            
-            import json
-            return json.dumps(customers_list, indent=2)
+            return records_json(customers_df)
             
         except Exception as e:
             logger.error(f"Error identifying churn risks: {e}")
@@ -248,18 +226,7 @@ class CustomerInsightsPlugin:
             if orders_df.empty:
                 return f"No orders found for customer {customer_id}"
             
-            orders_list = orders_df.to_dict(orient='records')
-            
-            # Convert to serializable format
-            for order in orders_list:
-                for key, value in order.items():
-                    if hasattr(value, 'isoformat'):
-                        order[key] = value.isoformat()
-                    elif not isinstance(value, (str, int, float, bool, type(None))):
-                        order[key] = str(value)
-            
-            import json
-            return json.dumps(orders_list, indent=2)
+            return records_json(orders_df)
             
         except Exception as e:
             logger.error(f"Error getting customer orders: {e}")
@@ -282,16 +249,7 @@ class CustomerInsightsPlugin:
             if segments_df.empty:
                 return "No segment data available"
             
-            segments_list = segments_df.to_dict(orient='records')
-            
-            # Convert to serializable format
-            for segment in segments_list:
-                for key, value in segment.items():
-                    if not isinstance(value, (str, int, float, bool, type(None))):
-                        segment[key] = float(value) if hasattr(value, '__float__') else str(value)
-            
-            import json
-            return json.dumps(segments_list, indent=2)
+            return records_json(segments_df)
             
         except Exception as e:
             logger.error(f"Error getting segment distribution: {e}")
@@ -3,6 +3,7 @@ from agent_framework import ai_function
 from typing import Annotated
 import logging
 import asyncio
+from .serialization import to_json
 
 logger = logging.getLogger(__name__)
 
@@ -58,12 +59,8 @@ class RecommendationEnginePlugin:
                 # Remove embedding vector from output (too large)
                 if 'descriptionEmbedding' in product:
                     del product['descriptionEmbedding']
-                for key, value in product.items():
-                    if not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        product[key] = float(value) if hasattr(value, '__float__') else str(value)
             
-            import json
-            return json.dumps(results, indent=2)
+            return to_json(results)
             
         except Exception as e:
             logger.error(f"Error in semantic product search: {e}")
@@ -97,12 +94,8 @@ class RecommendationEnginePlugin:
                 # Remove embedding vector
                 if 'descriptionEmbedding' in product:
                     del product['descriptionEmbedding']
-                for key, value in product.items():
-                    if not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        product[key] = float(value) if hasattr(value, '__float__') else str(value)
             
-            import json
-            return json.dumps(results, indent=2)
+            return to_json(results)
             
         except Exception as e:
             logger.error(f"Error finding similar products: {e}")
@@ -146,12 +139,8 @@ class RecommendationEnginePlugin:
                 # Remove embedding vector
                 if 'descriptionEmbedding' in rec:
                     del rec['descriptionEmbedding']
-                for key, value in rec.items():
-                    if not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        rec[key] = float(value) if hasattr(value, '__float__') else str(value)
             
-            import json
-            return json.dumps(top_products, indent=2)
+            return to_json(top_products)
             
         except Exception as e:
             logger.error(f"Error generating recommendations: {e}")
@@ -184,15 +173,7 @@ class RecommendationEnginePlugin:
             if 'descriptionEmbedding' in product:
                 del product['descriptionEmbedding']
             
-            # Convert to serializable format
-            for key, value in product.items():
-                if hasattr(value, 'isoformat'):
-                    product[key] = value.isoformat()
-                elif not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                    product[key] = str(value)
-            
-            import json
-            return json.dumps(product, indent=2)
+            return to_json(product)
             
         except Exception as e:
             logger.error(f"Error getting product details: {e}")
@@ -231,14 +212,8 @@ class RecommendationEnginePlugin:
             for product in products:
                 if 'descriptionEmbedding' in product:
                     del product['descriptionEmbedding']
-                
-                # Convert to serializable format
-                for key, value in product.items():
-                    if not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        product[key] = float(value) if hasattr(value, '__float__') else str(value)
             
-            import json
-            return json.dumps(products, indent=2)
+            return to_json(products)
             
         except Exception as e:
             logger.error(f"Error getting top-rated products: {e}")
@@ -267,8 +242,7 @@ class RecommendationEnginePlugin:
             
             categories_list = [{"category": cat} for cat in products]
             
-            import json
-            return json.dumps(categories_list, indent=2)
+            return to_json(categories_list)
             
         except Exception as e:
             logger.error(f"Error getting categories: {e}")
@@ -302,12 +276,8 @@ class RecommendationEnginePlugin:
                 # Remove embedding vector
                 if 'descriptionEmbedding' in product:
                     del product['descriptionEmbedding']
-                for key, value in product.items():
-                    if not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        product[key] = float(value) if hasattr(value, '__float__') else str(value)
             
-            import json
-            return json.dumps(products, indent=2)
+            return to_json(products)
             
         except Exception as e:
             logger.error(f"Error in text search: {e}")
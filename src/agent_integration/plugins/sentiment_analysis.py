@@ -2,6 +2,7 @@
 from agent_framework import ai_function
 from typing import Annotated
 import logging
+from .serialization import to_json
 
 logger = logging.getLogger(__name__)
 
@@ -43,19 +44,12 @@ class SentimentAnalysisPlugin:
             if not reviews:
                 return f"No reviews found for product {product_id}"
             
-            # Remove embedding vectors and convert dates
+            # Remove embedding vectors
             for review in reviews:
                 if 'reviewEmbedding' in review:
                     del review['reviewEmbedding']
-                
-                for key, value in review.items():
-                    if hasattr(value, 'isoformat'):
-                        review[key] = value.isoformat()
-                    elif not isinstance(value, (str, int, float, bool, type(None), dict, list)):
-                        review[key] = str(value)
             
-            import json
-            return json.dumps(reviews, indent=2)
+            return to_json(reviews)
             
         except Exception as e:
             logger.error(f"Error getting reviews: {e}")
@@ -98,8 +92,7 @@ class SentimentAnalysisPlugin:
                 summary['two_star_pct'] = (int(summary.get('two_star', 0)) / total_reviews) * 100
                 summary['one_star_pct'] = (int(summary.get('one_star', 0)) / total_reviews) * 100
             
-            import json
-            return json.dumps(summary, indent=2)
+            return to_json(summary)
             
         except Exception as e:
             logger.error(f"Error getting review summary: {e}")
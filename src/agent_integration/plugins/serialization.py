@@ -0,0 +1,23 @@
+"""JSON serialization shared by the agent plugins."""
+import json
+
+
+def _json_default(value):
+    """Encode values json cannot: dates as ISO 8601, numeric types as float, the rest as str."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, '__float__'):
+        return float(value)
+    return str(value)
+
+
+def to_json(data) -> str:
+    """Serialize plugin results (dicts/lists from SQL or Cosmos) as indented JSON."""
+    return json.dumps(data, indent=2, default=_json_default)
+
+
+def records_json(df) -> str:
+    """Serialize a DataFrame as an indented JSON list of row objects."""
+    # pandas serializes dates (ISO 8601), numpy scalars and Decimals in one
+    # pass; anything else falls back to str()
+    return df.to_json(orient='records', date_format='iso', default_handler=str, indent=2)
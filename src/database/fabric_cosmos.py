@@ -4,13 +4,30 @@ from azure.cosmos.container import ContainerProxy
 from azure.cosmos.database import DatabaseProxy
 from azure.identity import DefaultAzureCredential
 import pandas as pd
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import json
+import time
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+# Operations per transactional batch (service limit is 100 operations / 2 MB,
+# and each embedded document carries a ~30 KB vector)
+BULK_BATCH_SIZE = 50
+# Extra attempts for a batch still throttled (429) after the SDK's own retries
+BULK_THROTTLE_RETRIES = 3
+# Batches (or point creates) in flight at once per bulk call
+BULK_MAX_WORKERS = 16
+
+
+def _retry_after_ms(error: Exception) -> float:
+    """Milliseconds the service asked a throttled (429) request to wait."""
+    headers = getattr(error, 'headers', None) or {}
+    return float(headers.get('x-ms-retry-after-ms', 1000))
+
 
 class FabricCosmosDBConnector:
     """Connector for Microsoft Fabric CosmosDB NoSQL operations with vector search support using Entra ID authentication."""
@@ -148,6 +165,25 @@ class FabricCosmosDBConnector:
         if not self.database or not self.container:
             self.initialize()
     
+    def recreate_container(self, container: ContainerProxy) -> None:
+        """
+        Empty a container by dropping it and creating it again.
+        
+        Two management calls instead of one delete per item. The container
+        comes back with its original partition key and vector policies, via
+        initialize().
+        
+        Args:
+            container: One of this connector's containers
+        """
+        try:
+            self.database.delete_container(container.id)
+            self.initialize()
+            logger.info(f"Recreated container: {container.id}")
+        except exceptions.CosmosHttpResponseError as e:
+            logger.error(f"Error recreating container {container.id}: {e}")
+            raise
+    
     # Session tracking methods
     
     def create_session(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -161,15 +197,7 @@ class FabricCosmosDBConnector:
             Created session document
         """
         self._ensure_initialized()
-        
-        # Add metadata
-        session_data['id'] = session_data.get('id', session_data['sessionId'])
-        session_data['type'] = 'session'
-        session_data['createdAt'] = session_data.get(
-            'createdAt',
-            datetime.utcnow().isoformat()
-        )
-        session_data['updatedAt'] = datetime.utcnow().isoformat()
+        self._prepare_session(session_data)
         
         try:
             created_item = self.container.create_item(body=session_data)
@@ -179,6 +207,32 @@ class FabricCosmosDBConnector:
             logger.error(f"Failed to create session: {e}")
             raise
     
+    def create_sessions_bulk(self, sessions: List[Dict[str, Any]]) -> int:
+        """
+        Create many sessions using transactional batches per customer.
+        
+        Args:
+            sessions: Session dictionaries
+            
+        Returns:
+            Number of sessions created
+        """
+        self._ensure_initialized()
+        documents = [self._prepare_session(session_data) for session_data in sessions]
+        return self._create_items_bulk(self.container, documents, 'customerId', 'session')
+    
+    @staticmethod
+    def _prepare_session(session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add id, type and timestamp metadata to a session document."""
+        session_data['id'] = session_data.get('id', session_data['sessionId'])
+        session_data['type'] = 'session'
+        session_data['createdAt'] = session_data.get(
+            'createdAt',
+            datetime.utcnow().isoformat()
+        )
+        session_data['updatedAt'] = datetime.utcnow().isoformat()
+        return session_data
+    
     def get_session(self, session_id: str, customer_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a session by ID.
@@ -599,14 +653,7 @@ class FabricCosmosDBConnector:
             Created product document
         """
         self._ensure_initialized()
-        
-        # Add required fields
-        product_data['id'] = product_data.get('id', str(product_data.get('productId', product_data['sku'])))
-        product_data['type'] = 'product'
-        product_data['descriptionEmbedding'] = embedding
-        product_data['createdAt'] = product_data.get('createdAt', datetime.utcnow().isoformat())
-        product_data['updatedAt'] = datetime.utcnow().isoformat()
-        product_data['isActive'] = product_data.get('isActive', True)
+        self._prepare_product(product_data, embedding)
         
         try:
             created_item = self.products_container.create_item(body=product_data)
@@ -616,6 +663,31 @@ class FabricCosmosDBConnector:
             logger.error(f"Failed to create product: {e}")
             raise
     
+    def create_products_bulk(self, products: List[Tuple[Dict[str, Any], List[float]]]) -> int:
+        """
+        Create many products using transactional batches per category.
+        
+        Args:
+            products: (product_data, embedding) pairs
+            
+        Returns:
+            Number of products created
+        """
+        self._ensure_initialized()
+        documents = [self._prepare_product(product_data, embedding) for product_data, embedding in products]
+        return self._create_items_bulk(self.products_container, documents, 'category', 'product')
+    
+    @staticmethod
+    def _prepare_product(product_data: Dict[str, Any], embedding: List[float]) -> Dict[str, Any]:
+        """Add required fields and the embedding to a product document."""
+        product_data['id'] = product_data.get('id', str(product_data.get('productId', product_data['sku'])))
+        product_data['type'] = 'product'
+        product_data['descriptionEmbedding'] = embedding
+        product_data['createdAt'] = product_data.get('createdAt', datetime.utcnow().isoformat())
+        product_data['updatedAt'] = datetime.utcnow().isoformat()
+        product_data['isActive'] = product_data.get('isActive', True)
+        return product_data
+    
     def get_product(self, product_id: str, category: str) -> Optional[Dict[str, Any]]:
         """
         Get a product by ID.
@@ -897,13 +969,7 @@ class FabricCosmosDBConnector:
             Created review document
         """
         self._ensure_initialized()
-        
-        # Add required fields
-        review_data['id'] = review_data.get('id', f"review-{review_data['productId']}-{review_data.get('customerId', 'anon')}-{datetime.utcnow().timestamp()}")
-        review_data['type'] = 'review'
-        review_data['reviewEmbedding'] = embedding
-        review_data['createdAt'] = review_data.get('createdAt', datetime.utcnow().isoformat())
-        review_data['updatedAt'] = datetime.utcnow().isoformat()
+        self._prepare_review(review_data, embedding)
         
         try:
             created_item = self.reviews_container.create_item(body=review_data)
@@ -913,6 +979,30 @@ class FabricCosmosDBConnector:
             logger.error(f"Failed to create review: {e}")
             raise
     
+    def create_reviews_bulk(self, reviews: List[Tuple[Dict[str, Any], List[float]]]) -> int:
+        """
+        Create many reviews using transactional batches per product.
+        
+        Args:
+            reviews: (review_data, embedding) pairs
+            
+        Returns:
+            Number of reviews created
+        """
+        self._ensure_initialized()
+        documents = [self._prepare_review(review_data, embedding) for review_data, embedding in reviews]
+        return self._create_items_bulk(self.reviews_container, documents, 'productId', 'review')
+    
+    @staticmethod
+    def _prepare_review(review_data: Dict[str, Any], embedding: List[float]) -> Dict[str, Any]:
+        """Add required fields and the embedding to a review document."""
+        review_data['id'] = review_data.get('id', f"review-{review_data['productId']}-{review_data.get('customerId', 'anon')}-{datetime.utcnow().timestamp()}")
+        review_data['type'] = 'review'
+        review_data['reviewEmbedding'] = embedding
+        review_data['createdAt'] = review_data.get('createdAt', datetime.utcnow().isoformat())
+        review_data['updatedAt'] = datetime.utcnow().isoformat()
+        return review_data
+    
     def get_product_reviews(
         self,
         product_id: str,
@@ -1091,12 +1181,132 @@ class FabricCosmosDBConnector:
     # HELPER METHODS
     # ============================================================================
     
+    def upsert_items_bulk(
+        self,
+        container: ContainerProxy,
+        documents: List[Dict[str, Any]],
+        partition_key_field: str,
+        label: str = "item",
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Upsert ready-made documents with transactional batches per partition key.
+        
+        Args:
+            container: Target container
+            documents: Complete documents, including id and partition key
+            partition_key_field: Document field holding the partition key value
+            label: Document kind used in log messages
+            batch_size: Operations per transactional batch (at most 100)
+            
+        Returns:
+            Number of documents written
+        """
+        self._ensure_initialized()
+        return self._create_items_bulk(
+            container, documents, partition_key_field, label, operation="upsert", batch_size=batch_size
+        )
+    
+    def _create_items_bulk(
+        self,
+        container: ContainerProxy,
+        documents: List[Dict[str, Any]],
+        partition_key_field: str,
+        label: str,
+        max_workers: int = BULK_MAX_WORKERS,
+        operation: str = "create",
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Create (or upsert) documents with one transactional batch per partition key chunk.
+        
+        Batches for different partition keys run concurrently. A throttled
+        batch waits for the server's retry-after hint and is resent whole; a
+        batch that fails for any other reason is retried item by item (with
+        the same throttling backoff) so one bad document does not drop its
+        neighbours.
+        
+        Args:
+            container: Target container
+            documents: Prepared documents
+            partition_key_field: Document field holding the partition key value
+            label: Document kind used in log messages
+            max_workers: Concurrent batches
+            operation: "create", or "upsert" to overwrite existing documents
+            batch_size: Operations per transactional batch (at most 100)
+            
+        Returns:
+            Number of documents written
+        """
+        write_item = getattr(container, f"{operation}_item")
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for document in documents:
+            groups.setdefault(document[partition_key_field], []).append(document)
+        
+        batch_size = max(1, min(batch_size, 100))
+        chunks = [
+            (partition_key, items[start:start + batch_size])
+            for partition_key, items in groups.items()
+            for start in range(0, len(items), batch_size)
+        ]
+        # Start the largest batches first so a big one does not run alone at the end
+        chunks.sort(key=lambda chunk: len(chunk[1]), reverse=True)
+        
+        def run_chunk(chunk: Tuple[Any, List[Dict[str, Any]]]) -> Tuple[int, Counter]:
+            partition_key, items = chunk
+            # A single-document "batch" costs more than a point create, so
+            # partitions with one document skip the batch API
+            if len(items) > 1:
+                operations = [(operation, (item,)) for item in items]
+                for attempt in range(BULK_THROTTLE_RETRIES + 1):
+                    try:
+                        container.execute_item_batch(batch_operations=operations, partition_key=partition_key)
+                        return len(items), Counter()
+                    except (exceptions.CosmosBatchOperationError, exceptions.CosmosHttpResponseError) as e:
+                        if getattr(e, 'status_code', None) == 429 and attempt < BULK_THROTTLE_RETRIES:
+                            delay_ms = _retry_after_ms(e)
+                            logger.warning(f"Batch create of {len(items)} {label}s throttled, retrying in {delay_ms:.0f} ms")
+                            time.sleep(delay_ms / 1000)
+                            continue
+                        logger.warning(f"Batch create of {len(items)} {label}s failed, retrying individually: {e}")
+                        break
+            
+            created = 0
+            errors = Counter()
+            for item in items:
+                for attempt in range(BULK_THROTTLE_RETRIES + 1):
+                    try:
+                        write_item(body=item)
+                        created += 1
+                    except exceptions.CosmosHttpResponseError as e:
+                        if e.status_code == 429 and attempt < BULK_THROTTLE_RETRIES:
+                            time.sleep(_retry_after_ms(e) / 1000)
+                            continue
+                        errors[e.status_code] += 1
+                    break
+            return created, errors
+        
+        # Per-document failures are tallied by status code and logged once,
+        # so a systematic failure does not emit one line per document
+        created = 0
+        errors = Counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk_created, chunk_errors in executor.map(run_chunk, chunks):
+                created += chunk_created
+                errors.update(chunk_errors)
+        if errors:
+            logger.error(f"Failed to create {sum(errors.values())} {label}s, by status code: {dict(errors)}")
+        
+        logger.info(f"Created {created}/{len(documents)} {label}s in {len(chunks)} batches")
+        return created
+    
     def query_items(
         self,
         query: str,
         parameters: Optional[List[Dict[str, Any]]] = None,
         enable_cross_partition: bool = True,
-        container: Optional[ContainerProxy] = None
+        container: Optional[ContainerProxy] = None,
+        max_item_count: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute a SQL query on the specified container.
@@ -1106,6 +1316,7 @@ class FabricCosmosDBConnector:
             parameters: Optional query parameters
             enable_cross_partition: Enable cross-partition query
             container: Optional container to query (defaults to sessions container)
+            max_item_count: Optional page size for the query iterator
             
         Returns:
             List of matching documents
@@ -1117,7 +1328,8 @@ class FabricCosmosDBConnector:
             items = list(target_container.query_items(
                 query=query,
                 parameters=parameters,
-                enable_cross_partition_query=enable_cross_partition
+                enable_cross_partition_query=enable_cross_partition,
+                max_item_count=max_item_count
             ))
             logger.info(f"Query returned {len(items)} items")
             return items
@@ -1,18 +1,37 @@
 """Microsoft Fabric SQL Database connector for customer and order data."""
 import mssql_python
 import pandas as pd
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 import logging
 from contextlib import contextmanager
 from azure.identity import DefaultAzureCredential
 import struct
 from datetime import datetime, timedelta
 import threading
+import queue
+import time
 import hashlib
 import pickle
+import json
+import re
 
 logger = logging.getLogger(__name__)
 
+# Pooled connections idle longer than this are closed instead of reused
+POOL_IDLE_TIMEOUT_SECONDS = 300
+
+# SQL Server accepts at most 2100 parameters per statement and 1000 rows per
+# VALUES list
+MAX_STATEMENT_PARAMETERS = 2099
+MAX_VALUES_ROWS = 1000
+# Parameters per widened multi-row INSERT; statements near the 2100 cap
+# compile noticeably slower than ones around a thousand parameters
+VALUES_BATCH_PARAMETERS = 1000
+
+# Single-row "INSERT ... VALUES (?, ?, ...)" statements that can be widened
+# into multi-row VALUES lists
+_SINGLE_ROW_INSERT = re.compile(r"^(.*\bVALUES\s*)(\(\s*\?(?:\s*,\s*\?)*\s*\))\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+
 
 class FabricSQLConnector:
     """Connector for Microsoft Fabric SQL Database operations using Entra ID authentication."""
@@ -62,6 +81,9 @@ class FabricSQLConnector:
         self._query_cache: Dict[str, tuple[pd.DataFrame, datetime]] = {}
         self._cache_lock = threading.Lock()
         
+        # Idle connections (LIFO so the warmest connection is reused first)
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=max(pool_size, 0))
+        
         # Connection string (reusable)
         self._connection_string = (
             f"DRIVER={{ODBC Driver 18 for SQL Server}};"
@@ -153,48 +175,98 @@ class FabricSQLConnector:
             self._query_cache.clear()
             logger.info("Query cache cleared")
         
+    def _connect(self):
+        """
+        Open a new connection using Entra ID token authentication.
+        
+        Returns:
+            mssql_python.Connection: Database connection
+        """
+        # Get access token
+        token = self._get_access_token()
+        
+        # SQL_COPT_SS_ACCESS_TOKEN constant for access token authentication
+        SQL_COPT_SS_ACCESS_TOKEN = 1256
+        
+        # Encode token for SQL Server (same format as pyodbc)
+        token_bytes = token.encode("utf-16-le")
+        token_struct = struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
+        
+        # Connect with access token using mssql-python
+        return mssql_python.connect(
+            self._connection_string,
+            attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct},
+            timeout=30
+        )
+    
+    def _acquire_connection(self):
+        """Take a fresh idle connection from the pool, or open a new one."""
+        while True:
+            try:
+                conn, released_at = self._pool.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - released_at < POOL_IDLE_TIMEOUT_SECONDS:
+                return conn
+            self._close_quietly(conn)
+    
+    def _release_connection(self, conn) -> None:
+        """Return a healthy connection to the pool, closing it if the pool is full."""
+        if self.pool_size <= 0:
+            self._close_quietly(conn)
+            return
+        try:
+            # Discard anything the caller left uncommitted, as close() did
+            conn.rollback()
+            self._pool.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._close_quietly(conn)
+        except Exception as e:
+            logger.warning(f"Dropping connection that failed to reset: {e}")
+            self._close_quietly(conn)
+    
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        """Close a connection, ignoring errors from already-broken sessions."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        while True:
+            try:
+                conn, _ = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(conn)
+    
     @contextmanager
     def get_connection(self):
         """
-        Context manager for database connections using Entra ID authentication.
+        Context manager for pooled database connections using Entra ID authentication.
+        
+        Up to pool_size idle connections are kept open and reused, so repeated
+        calls skip the TLS handshake and login. A connection that raised is
+        closed rather than returned to the pool.
         
         Yields:
             mssql_python.Connection: Database connection
         """
         conn = None
         try:
-            # Get access token
-            token = self._get_access_token()
-            
-            # Build connection string
-            connection_string = (
-                f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-                f"SERVER={self.endpoint};"
-                f"DATABASE={self.database};"
-                f"Encrypt=yes;"
-                f"TrustServerCertificate=no;"
-            )
-            
-            # SQL_COPT_SS_ACCESS_TOKEN constant for access token authentication
-            SQL_COPT_SS_ACCESS_TOKEN = 1256
-            
-            # Encode token for SQL Server (same format as pyodbc)
-            token_bytes = token.encode("utf-16-le")
-            token_struct = struct.pack(f"<I{len(token_bytes)}s", len(token_bytes), token_bytes)
-            
-            # Connect with access token using mssql-python
-            conn = mssql_python.connect(
-                connection_string,
-                attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct},
-                timeout=30
-            )
+            conn = self._acquire_connection()
             yield conn
         except Exception as e:
             logger.error(f"Database connection error: {e}")
+            if conn:
+                self._close_quietly(conn)
+                conn = None
             raise
         finally:
             if conn:
-                conn.close()
+                self._release_connection(conn)
     
     def execute_query(self, query: str, params: Optional[tuple] = None) -> pd.DataFrame:
         """
@@ -241,6 +313,45 @@ class FabricSQLConnector:
             logger.error(f"Query execution error: {e}")
             raise
     
+    def fetch_rows(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """
+        Execute a SELECT query and return the raw rows.
+        
+        Unlike execute_query, no DataFrame is built and nothing is cached,
+        which suits small lookups whose result feeds straight into Python.
+        
+        Args:
+            query: SQL query to execute
+            params: Optional query parameters
+        
+        Returns:
+            List of row tuples
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params or ())
+                rows = [tuple(row) for row in cursor.fetchall()]
+                cursor.close()
+            logger.info(f"Query executed successfully, returned {len(rows)} rows")
+            return rows
+        except Exception as e:
+            logger.error(f"Query execution error: {e}")
+            raise
+    
+    def fetch_scalars(self, query: str, params: Optional[tuple] = None) -> List[Any]:
+        """
+        Execute a SELECT query and return the first column of every row.
+        
+        Args:
+            query: SQL query to execute
+            params: Optional query parameters
+        
+        Returns:
+            List of first-column values
+        """
+        return [row[0] for row in self.fetch_rows(query, params)]
+    
     def execute_batch_queries(self, queries: List[str]) -> List[pd.DataFrame]:
         """
         Execute multiple queries in a single connection (more efficient).
@@ -298,6 +409,64 @@ class FabricSQLConnector:
             logger.error(f"Non-query execution error: {e}")
             raise
     
+    def execute_many(
+        self,
+        query: str,
+        rows: List[tuple],
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Execute a parameterized statement for many rows on one connection.
+        
+        Autocommit is disabled and rows are sent in chunks of batch_size,
+        committed once at the end, so the server flushes its log once.
+        Drivers with pyodbc-style fast_executemany bind each chunk as a
+        parameter array; otherwise a single-row INSERT ... VALUES statement
+        is widened into multi-row VALUES lists so each chunk still costs a
+        handful of round trips instead of one per row.
+        
+        Args:
+            query: Parameterized SQL statement
+            rows: Parameter tuples, one per row
+            batch_size: Rows per executemany call
+            
+        Returns:
+            Number of rows submitted
+        """
+        if not rows:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                conn.autocommit = False
+                cursor = conn.cursor()
+                insert = _SINGLE_ROW_INSERT.match(query)
+                # pyodbc-style array binding, when the driver offers it
+                if hasattr(cursor, 'fast_executemany'):
+                    cursor.fast_executemany = True
+                    insert = None
+                if insert:
+                    prefix, row_placeholders = insert.groups()
+                    rows_per_statement = max(1, min(
+                        batch_size, MAX_VALUES_ROWS,
+                        min(VALUES_BATCH_PARAMETERS, MAX_STATEMENT_PARAMETERS) // len(rows[0])
+                    ))
+                    for start in range(0, len(rows), rows_per_statement):
+                        chunk = rows[start:start + rows_per_statement]
+                        cursor.execute(
+                            prefix + ", ".join([row_placeholders] * len(chunk)),
+                            tuple(value for row in chunk for value in row)
+                        )
+                else:
+                    for start in range(0, len(rows), batch_size):
+                        cursor.executemany(query, rows[start:start + batch_size])
+                conn.commit()
+                cursor.close()
+            logger.info(f"Batch insert executed successfully, {len(rows)} rows")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Batch insert execution error: {e}")
+            raise
+    
     def execute_stored_procedure(
         self, 
         proc_name: str, 
@@ -507,10 +676,10 @@ class FabricSQLConnector:
         query = """
         INSERT INTO ca.Customers 
         (FirstName, LastName, Email, Phone, DateOfBirth, 
-         Country, City, CustomerSegment)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+         Country, City)
+        OUTPUT INSERTED.CustomerID
+        VALUES (?, ?, ?, ?, ?, ?, ?);
         """
-        query_id = "SELECT SCOPE_IDENTITY() as CustomerID;"
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -521,17 +690,115 @@ class FabricSQLConnector:
                 customer_data.get('Phone'),
                 customer_data.get('DateOfBirth'),
                 customer_data.get('Country'),
-                customer_data.get('City'),
-                customer_data.get('CustomerSegment', 'Bronze')
+                customer_data.get('City')
             ))
-            # Execute separate query to get the ID
-            cursor.execute(query_id)
+            # OUTPUT returns the new ID without a second round trip
             result = cursor.fetchone()
             customer_id = result[0] if result else None
             conn.commit()
             cursor.close()
         return int(customer_id) if customer_id else 0
     
+    def insert_customers_bulk(self, rows: List[tuple], batch_size: int = 5000) -> List[int]:
+        """
+        Insert many customers in one transaction and return their IDs.
+        
+        Each batch is sent as a single JSON array parameter and shredded
+        server-side with OPENJSON, so a batch costs one round trip regardless
+        of its size, and INSERT ... OUTPUT returns the new CustomerIDs without
+        a follow-up SELECT.
+        
+        Args:
+            rows: Tuples of (FirstName, LastName, Email, Phone, DateOfBirth, Country, City)
+            batch_size: Rows per JSON document
+            
+        Returns:
+            List of inserted CustomerIDs
+        """
+        if not rows:
+            return []
+        query = """
+        INSERT INTO ca.Customers 
+        (FirstName, LastName, Email, Phone, DateOfBirth, 
+         Country, City)
+        OUTPUT INSERTED.CustomerID
+        SELECT FirstName, LastName, Email, Phone, DateOfBirth, Country, City
+        FROM OPENJSON(?) WITH (
+            FirstName NVARCHAR(100) '$[0]',
+            LastName NVARCHAR(100) '$[1]',
+            Email NVARCHAR(255) '$[2]',
+            Phone NVARCHAR(20) '$[3]',
+            DateOfBirth DATE '$[4]',
+            Country NVARCHAR(100) '$[5]',
+            City NVARCHAR(100) '$[6]'
+        );
+        """
+        customer_ids = []
+        try:
+            with self.get_connection() as conn:
+                conn.autocommit = False
+                cursor = conn.cursor()
+                for start in range(0, len(rows), max(1, batch_size)):
+                    # Dates serialize as ISO strings, which OPENJSON converts to DATE
+                    payload = json.dumps(rows[start:start + batch_size], default=str)
+                    cursor.execute(query, (payload,))
+                    customer_ids.extend(int(row[0]) for row in cursor.fetchall())
+                conn.commit()
+                cursor.close()
+            logger.info(f"Bulk customer insert executed successfully, {len(customer_ids)} rows")
+            return customer_ids
+        except Exception as e:
+            logger.error(f"Bulk customer insert error: {e}")
+            raise
+    
+    def insert_json_rows(
+        self,
+        table: str,
+        columns: Sequence[Tuple[str, str]],
+        rows: List[tuple]
+    ) -> int:
+        """
+        Insert many rows as one JSON array parameter in a single statement.
+        
+        The rows are shredded server-side with OPENJSON, the same way as
+        insert_customers_bulk, so the whole list costs one round trip and
+        one parameter instead of a parameter array per batch.
+        
+        Args:
+            table: Target table, e.g. ca.Orders
+            columns: (column name, SQL type) pairs in row order
+            rows: Parameter tuples, one per row
+            
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        names = ", ".join(name for name, _ in columns)
+        shape = ",\n            ".join(
+            f"{name} {sql_type} '$[{position}]'" for position, (name, sql_type) in enumerate(columns)
+        )
+        query = f"""
+        INSERT INTO {table} ({names})
+        SELECT {names}
+        FROM OPENJSON(?) WITH (
+            {shape}
+        );
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.autocommit = False
+                cursor = conn.cursor()
+                # Dates serialize as ISO strings, which OPENJSON converts
+                cursor.execute(query, (json.dumps(rows, default=str),))
+                conn.commit()
+                cursor.close()
+            logger.info(f"JSON insert into {table} executed successfully, {len(rows)} rows")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"JSON insert into {table} error: {e}")
+            raise
+    
     def update_customer_lifetime_value(self, customer_id: int) -> None:
         """Update customer lifetime value using stored procedure."""
         self.execute_stored_procedure(
@@ -539,9 +806,27 @@ class FabricSQLConnector:
             {'CustomerID': customer_id}
         )
     
-    def update_customer_segmentation(self) -> None:
-        """Update all customer segments based on lifetime value."""
-        self.execute_stored_procedure('ca.sp_UpdateCustomerSegmentation')
+    def update_customer_lifetime_values(self, customer_ids: List[int]) -> int:
+        """
+        Update lifetime value for many customers in a single round trip.
+        
+        Args:
+            customer_ids: Customer IDs to recompute
+            
+        Returns:
+            Number of affected rows
+        """
+        if not customer_ids:
+            return 0
+        # Fill the ca.IntList TVP server-side from a JSON array so the call
+        # does not depend on driver support for table-valued parameters
+        query = """
+        DECLARE @Ids ca.IntList;
+        INSERT INTO @Ids (Id)
+        SELECT DISTINCT CAST([value] AS INT) FROM OPENJSON(?);
+        EXEC ca.sp_UpdateCustomerLifetimeValueBatch @Ids = @Ids;
+        """
+        return self.execute_non_query(query, (json.dumps([int(i) for i in customer_ids]),))
     
     def test_connection(self) -> bool:
         """Test database connection."""
@@ -1,13 +1,21 @@
 """Configuration management utilities."""
 import os
-from dotenv import load_dotenv
+from functools import cache
 from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@cache
+def load_environment() -> None:
+    """Load environment variables from .env once per process."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
 # Load environment variables
-load_dotenv()
+load_environment()
 
 
 class Config: